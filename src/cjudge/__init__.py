@@ -1,4 +1,7 @@
 from .scripts.create import cli_create
 from .scripts.info import cli_info
 from .scripts.test import cli_test
-from .scripts.submit import cli_submit
\ No newline at end of file
+from .scripts.submit import cli_submit
+from .scripts.stress import cli_stress
+from .scripts.scale import cli_scale
+from .scripts.history import cli_history
@@ -0,0 +1,105 @@
+from pathlib import Path, PurePosixPath
+import contextlib
+import shutil
+import tarfile
+import threading
+import zipfile
+
+class SampleArchive():
+    """
+    Samples stored in a zip or tar archive, their members are read in place
+    without extracting them. The sample name is the member path without its
+    suffix, inputs end in `.in` and expected outputs in `.out` or `.ans`.
+
+    Attributes:
+        path (Path): Archive file
+        inputs (dict): Input member of every sample
+        outputs (dict): Expected output member of every sample
+    """
+
+    input_suffixes = [".in"]
+    output_suffixes = [".out", ".ans"]
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path): Zip or tar archive, tar archives may be compressed
+
+        Raises:
+            FileNotFoundError: If the file isn't a zip or tar archive
+        """
+        self.path = Path(path)
+        self.zip_file = None
+        self.tar_file = None
+        self.tar_members = {}
+
+        # Members are read by several threads and archives aren't thread safe
+        self.lock = threading.Lock()
+
+        if(zipfile.is_zipfile(self.path)):
+            self.zip_file = zipfile.ZipFile(self.path)
+            members = [info.filename for info in self.zip_file.infolist() if not info.is_dir()]
+        elif(tarfile.is_tarfile(self.path)):
+            self.tar_file = tarfile.open(self.path)
+            self.tar_members = {info.name: info for info in self.tar_file.getmembers() if info.isfile()}
+            members = list(self.tar_members)
+        else:
+            raise FileNotFoundError(f"'{self.path}' isn't a zip or tar archive")
+
+        self.inputs = {}
+        self.outputs = {}
+        for member in members:
+            member_path = PurePosixPath(member)
+            name = str(member_path.with_suffix(""))
+            if(member_path.suffix in self.input_suffixes):
+                self.inputs[name] = member
+            elif(member_path.suffix in self.output_suffixes):
+                self.outputs.setdefault(name, member)
+
+    def read(self, member: str) -> bytes:
+        """
+        Read a member of the archive into memory
+        """
+        with self.lock:
+            if(self.zip_file != None):
+                return self.zip_file.read(member)
+            with self.tar_file.extractfile(member) as file:
+                return file.read()
+
+    @contextlib.contextmanager
+    def open(self, member: str):
+        """
+        Open a member of the archive as a binary file that is decompressed
+        while it is read, nothing is written to the disk. Tar members are
+        read with their own handle of the archive, so several members can
+        be read by different threads at the same time.
+        """
+        if(self.zip_file != None):
+            # Zip members share the archive file through a lock
+            with self.lock:
+                file = self.zip_file.open(member)
+            with file:
+                yield file
+            return
+
+        with tarfile.open(self.path) as tar_file, tar_file.extractfile(self.tar_members[member]) as file:
+            yield file
+
+    def copy(self, member: str, file):
+        """
+        Write a member of the archive to a binary file in chunks
+        """
+        with self.open(member) as source:
+            shutil.copyfileobj(source, file)
+
+    def read_input(self, sample: str) -> bytes:
+        return self.read(self.inputs[sample])
+
+    def open_output(self, sample: str):
+        return self.open(self.outputs[sample])
+
+    def close(self):
+        if(self.zip_file != None):
+            self.zip_file.close()
+        if(self.tar_file != None):
+            self.tar_file.close()
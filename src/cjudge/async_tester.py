@@ -0,0 +1,150 @@
+from pathlib import Path
+import asyncio
+import os
+import tempfile
+
+from .comparator import open_output
+from .compiler import Compiler
+from .error import ProgramError
+from .runner import AsyncExecution, get_runner
+from .tester import Tester
+
+class AsyncTester(Tester):
+    """
+    Runs the samples of a problem inside an asyncio event loop
+
+    Programs run as asyncio subprocesses and a semaphore bounds how many of
+    them run at the same time, so no thread is blocked while tests run.
+    Nothing is printed, the results are returned to the caller. Outputs are
+    checked with the checker of the problem if it has one, interactive
+    problems can't be run.
+
+    Example:
+        tester = AsyncTester(path, jobs=4)
+        results = await tester.run_all()
+    """
+
+    def __init__(self, path, jobs = None, create_files = False, interactor = None, checker = None):
+        """
+        Args:
+            path (Path): Problem folder
+            jobs (int): Number of tests that run at the same time
+            create_files (bool): Save the output of every test in a result file
+            interactor (Path): Interactor source, interactive problems raise a `ProgramError` when compiled
+            checker (Path): Checker source, by default 'checker.cpp' if it exists
+        """
+        super().__init__(path, "error", create_files, jobs, stream=False, interactor=interactor, checker=checker, cache=False, prepare=False)
+
+        self.source = None
+        self.samples = None
+        self.semaphore = asyncio.Semaphore(self.jobs)
+
+    async def compile(self):
+        """
+        Compile the source and the checker, the compiler runs in a worker thread
+
+        Raises:
+            ProgramError: If the problem is interactive
+        """
+        if(not self.cpp_file.exists()):
+            raise FileNotFoundError("Couldn't find problem file")
+        if(self.interactor_file != None):
+            raise ProgramError("interactor", "Interactive problems can't be run by the async tester")
+
+        self.source = await asyncio.to_thread(Compiler().compile, self.cpp_file)
+        if(self.checker_file != None):
+            self.checker = await asyncio.to_thread(Compiler().compile, self.checker_file)
+        if(os.name == "posix"):
+            await asyncio.to_thread(get_runner)
+
+    async def run_sample(self, sample, full = None):
+        """
+        Run a sample, compiling the source first if needed
+
+        Args:
+            sample (str): Sample name
+            full (bool): If the sample has an expected output, by default it is checked
+
+        Returns:
+            tuple: Verdict, answer lines as returned by `compare_outputs` or
+                the checker feedback and the execution
+        """
+        if(self.source == None):
+            await self.compile()
+        if(full == None):
+            full = Path(self.sample_folder, f"{sample}.out").exists()
+
+        async with self.semaphore:
+            input = await asyncio.to_thread(self.read_input, sample)
+
+            execution = AsyncExecution(limits=self.limits)
+            await execution.start(self.source)
+            output = await execution.communicate(input)
+
+        if(self.create_files):
+            await asyncio.to_thread(Path(self.sample_folder, f"{sample}.res").write_bytes, output)
+
+        result = execution.get_verdict()
+        answer = None
+        if(full):
+            if(result == None and self.checker_file != None):
+                result, answer = await asyncio.to_thread(self.check_output, sample, output)
+            elif(result == None):
+                # The expected output is read from the disk
+                def compare():
+                    with self.open_expected(sample) as expected_file:
+                        return self.compare_outputs(open_output(output), expected_file)
+
+                is_correct_answer, answer = await asyncio.to_thread(compare)
+                result = "AC" if is_correct_answer else "WA"
+        else:
+            if(result == None):
+                result = "NI"
+            answer = self.preview_output(open_output(output))
+
+        return result, answer, execution
+
+    def check_output(self, sample, output: bytes):
+        """
+        Check the output of a sample with the checker, the output is written
+        to the result file or to a temporary file that is removed afterwards
+
+        Returns:
+            tuple: Verdict and the checker feedback
+        """
+        if(self.create_files):
+            return self.run_checker(sample, Path(self.sample_folder, f"{sample}.res"))
+
+        with tempfile.NamedTemporaryFile(suffix=".res", delete=False) as result_file:
+            result_file.write(output)
+        output_path = Path(result_file.name)
+        try:
+            return self.run_checker(sample, output_path)
+        finally:
+            output_path.unlink(missing_ok=True)
+
+    async def run_all(self, names = None, callback = None):
+        """
+        Run the samples concurrently, compiling the source first if needed
+
+        Args:
+            names (set): Names of the samples to run, None to run all of them
+            callback: Called with the sample name, verdict, answer and
+                execution of every test as soon as it finishes
+
+        Returns:
+            list: Sample name, verdict, answer and execution of every test in natural-sort order
+        """
+        if(self.source == None):
+            await self.compile()
+        await asyncio.to_thread(self.get_samples)
+
+        samples = [(full, sample) for full, sample in self.samples if names == None or sample in names]
+
+        async def run_sample(full, sample):
+            result, answer, execution = await self.run_sample(sample, full)
+            if(callback != None):
+                callback(sample, result, answer, execution)
+            return sample, result, answer, execution
+
+        return await asyncio.gather(*[run_sample(full, sample) for full, sample in samples])
@@ -0,0 +1,100 @@
+from pathlib import Path
+import hashlib
+import os
+import threading
+
+from .config import Config
+
+class BinaryCache():
+    """
+    Persistent cache of compiled binaries
+
+    Binaries are stored under a key that identifies everything that changes
+    the compiler output. When the cache grows over its size limit the least
+    recently used binaries are removed.
+    """
+
+    cache_folder = Path(Config.config_folder, "cache", "bin")
+
+    def __init__(self, max_size: int = None):
+        """
+        Args:
+            max_size (int): Maximum size of the cache in bytes
+        """
+        if(max_size == None):
+            max_size = Config.get_cache_size() * 1024 * 1024
+
+        self.max_size = max_size
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_key(*parts) -> str:
+        """
+        Get the cache key of a list of strings or bytes
+        """
+        key = hashlib.sha256()
+        for part in parts:
+            if(type(part) == str):
+                part = part.encode("UTF-8")
+            key.update(hashlib.sha256(part).digest())
+        return key.hexdigest()
+
+    def get_path(self, key: str) -> Path:
+        return Path(self.cache_folder, key)
+
+    def get(self, key: str) -> Path:
+        """
+        Get a cached binary and mark it as recently used
+
+        Returns:
+            Path: Binary path or None if it isn't cached
+        """
+        path = self.get_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_temporary_path(self, key: str) -> Path:
+        """
+        Get a path in the cache folder where a binary can be created before
+        adding it with `put`
+        """
+        return Path(self.cache_folder, f".{key}.{os.getpid()}.{threading.get_ident()}")
+
+    def put(self, key: str, binary: Path) -> Path:
+        """
+        Move a binary into the cache and evict old binaries if needed
+
+        Returns:
+            Path: Cached binary path
+        """
+        path = self.get_path(key)
+        os.replace(binary, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        """
+        Remove the least recently used binaries until the cache fits its size limit
+        """
+        entries = []
+        total_size = 0
+        for file in self.cache_folder.iterdir():
+            # Binaries that are still being created start with a dot
+            if(file.name.startswith(".")):
+                continue
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, file in entries:
+            if(total_size <= self.max_size):
+                break
+            file.unlink(missing_ok=True)
+            total_size -= size
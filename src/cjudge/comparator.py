@@ -0,0 +1,122 @@
+import io
+import math
+import re
+
+# Characters read from an output at a time
+chunk_size = 64 * 1024
+
+token_regex = re.compile(r"\S+")
+number_regex = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+def open_output(data: bytes):
+    """
+    Open a program output kept in memory as a text file with universal
+    newlines, like the expected outputs read from the disk
+    """
+    return io.StringIO(data.decode(errors="replace"), newline=None)
+
+def tokenize(file):
+    """
+    Yield the whitespace separated tokens of a file reading it in chunks, so
+    only the current chunk is kept in memory. Every token is a tuple
+    `(token, line, column)`.
+
+    Args:
+        file: Text file to read
+    """
+    line = 1
+    line_start = 0
+    offset = 0
+    data = ""
+
+    while(True):
+        chunk = file.read(chunk_size)
+        data += chunk
+        end = len(chunk) == 0
+
+        # Position up to which the lines were counted and position of the
+        # token that may continue in the next chunk
+        counted = 0
+        keep = len(data)
+        for match in token_regex.finditer(data):
+            if(not end and match.end() == len(data)):
+                keep = match.start()
+                break
+
+            newlines = data.count("\n", counted, match.start())
+            if(newlines > 0):
+                line += newlines
+                line_start = offset + data.rindex("\n", counted, match.start()) + 1
+            counted = match.end()
+
+            yield match.group(), line, offset + match.start() - line_start + 1
+
+        if(end):
+            return
+
+        newlines = data.count("\n", counted, keep)
+        if(newlines > 0):
+            line += newlines
+            line_start = offset + data.rindex("\n", counted, keep) + 1
+
+        data = data[keep:]
+        offset += keep
+
+def tokens_match(token1: str, token2: str, tolerance: float) -> bool:
+    """
+    Check if two tokens are equal, numbers match if their absolute or
+    relative difference is within the tolerance
+    """
+    if(token1 == token2):
+        return True
+    if(not number_regex.fullmatch(token1) or not number_regex.fullmatch(token2)):
+        return False
+
+    number1 = float(token1)
+    number2 = float(token2)
+    if(not math.isfinite(number1) or not math.isfinite(number2)):
+        return False
+
+    difference = abs(number1 - number2)
+    return difference <= tolerance or difference <= tolerance * abs(number2)
+
+def compare_tokens(file1, file2, tolerance: float):
+    """
+    Compare two outputs token by token ignoring how they are split in lines.
+    Both files are read lazily and the comparison stops on the first
+    different token.
+
+    Args:
+        file1: Text file with the program output
+        file2: Text file with the expected output
+        tolerance (float): Absolute and relative tolerance of the numbers
+
+    Returns:
+        tuple: If the outputs match and the operations showing the first
+            different token as returned by `diff_lines`, None if they match
+    """
+    tokens1 = tokenize(file1)
+    tokens2 = tokenize(file2)
+
+    index = 0
+    while(True):
+        index += 1
+        token1 = next(tokens1, None)
+        token2 = next(tokens2, None)
+
+        if(token1 == None and token2 == None):
+            return True, None
+        if(token1 != None and token2 != None and tokens_match(token1[0], token2[0], tolerance)):
+            continue
+
+        if(token1 != None):
+            position = f"Token {index} at line {token1[1]}, column {token1[2]}"
+        else:
+            position = f"Token {index} after the end of your output"
+
+        answer = [('M', position)]
+        if(token1 != None):
+            answer.append(('D', token1[0]))
+        if(token2 != None):
+            answer.append(('I', token2[0]))
+        return False, answer
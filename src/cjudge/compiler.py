@@ -0,0 +1,123 @@
+from pathlib import Path
+import os
+import re
+import subprocess
+import threading
+
+from .cache import BinaryCache
+from .config import Config
+from .error import CompilationError
+
+class Compiler():
+    """
+    C++ compiler that reuses cached binaries when the source hasn't changed
+    """
+
+    _versions = {}
+    _versions_lock = threading.Lock()
+
+    pch_folder = Path(Config.config_folder, "cache", "pch")
+    _pch_lock = threading.Lock()
+    _pch_include = re.compile(rb"^\s*#\s*include\s*<bits/stdc\+\+\.h>", re.MULTILINE)
+
+    def __init__(self, compiler: str = None, flags: list = None, precompiled_header: bool = None):
+        self.compiler = compiler if compiler != None else Config.get_compiler()
+        self.flags = flags if flags != None else Config.get_compiler_flags()
+        self.precompiled_header = precompiled_header if precompiled_header != None else Config.get_precompiled_header()
+        self.cache = BinaryCache()
+
+    @property
+    def version(self) -> str:
+        """Compiler version, queried once per compiler"""
+        with Compiler._versions_lock:
+            version = Compiler._versions.get(self.compiler)
+            if(version == None):
+                try:
+                    sub = subprocess.run([self.compiler, "--version"], capture_output=True)
+                except FileNotFoundError:
+                    raise CompilationError(f"Couldn't find the compiler '{self.compiler}'")
+                version = sub.stdout.decode(errors="replace")
+                Compiler._versions[self.compiler] = version
+        return version
+
+    def get_key(self, source: bytes) -> str:
+        return BinaryCache.get_key(source, self.compiler, "\0".join(self.flags), self.version)
+
+    def get_pch_folder(self) -> Path:
+        """
+        Get an include folder with `bits/stdc++.h` precompiled for the
+        compiler and flags, building it the first time or when the compiler
+        version changes
+
+        Returns:
+            Path: Include folder or None if the header can't be precompiled
+        """
+        # Clang doesn't pick up GCC precompiled headers from include folders
+        if("clang" in self.version):
+            return None
+
+        folder = Path(self.pch_folder, BinaryCache.get_key(self.compiler, "\0".join(self.flags)))
+        header = Path(folder, "bits", "stdc++.h.gch")
+        version_file = Path(folder, "version")
+
+        with Compiler._pch_lock:
+            if(version_file.exists() and version_file.read_text() == self.version):
+                return folder if header.exists() else None
+
+            header.parent.mkdir(parents=True, exist_ok=True)
+            header.unlink(missing_ok=True)
+
+            # GCC can't precompile from stdin, the system header is wrapped instead
+            wrapper = Path(folder, ".stdc++.h")
+            wrapper.write_text("#include <bits/stdc++.h>\n")
+
+            temporary_header = Path(header.parent, f".stdc++.h.gch.{os.getpid()}")
+            try:
+                sub = subprocess.run(
+                    [self.compiler, *self.flags, "-x", "c++-header", wrapper, "-o", temporary_header],
+                    capture_output=True
+                )
+                # A failed build is remembered so it isn't retried on every compilation
+                if(sub.returncode == 0):
+                    os.replace(temporary_header, header)
+                version_file.write_text(self.version)
+            finally:
+                temporary_header.unlink(missing_ok=True)
+
+        return folder if header.exists() else None
+
+    def compile(self, cpp_file: Path) -> Path:
+        """
+        Compile a source file or get its binary from the cache
+
+        Args:
+            cpp_file (Path): C++ source file
+
+        Returns:
+            Path: Compiled binary
+        """
+        if(not cpp_file.exists()):
+            raise FileNotFoundError(f"Couldn't find '{cpp_file.name}'")
+
+        with open(cpp_file, "rb") as file:
+            source = file.read()
+
+        key = self.get_key(source)
+        binary = self.cache.get(key)
+        if(binary != None):
+            return binary
+
+        flags = self.flags
+        if(self.precompiled_header and Compiler._pch_include.search(source)):
+            pch_folder = self.get_pch_folder()
+            if(pch_folder != None):
+                flags = ["-I", pch_folder, *flags]
+
+        temporary_binary = self.cache.get_temporary_path(key)
+        try:
+            sub = subprocess.run([self.compiler, *flags, "-o", temporary_binary, cpp_file], capture_output=True)
+            if sub.returncode != 0:
+                raise CompilationError(sub.stderr.decode())
+            return self.cache.put(key, temporary_binary)
+        finally:
+            temporary_binary.unlink(missing_ok=True)
@@ -8,6 +8,7 @@ class Config:
     """
 
     config_folder = Path(Path.home(), ".cjudge")
+    problem_config_file = Path(".cjudge", "config.json")
     config_file = Path(config_folder, "config.json")
     template_file = Path(config_folder, "template.cpp")
     package_config_folder = Path(Path(__file__).parent, "config")
@@ -108,6 +109,54 @@ class Config:
             compiler = Config.repair_config_parameter(config_json, "compiler")
             return compiler
     
+    @staticmethod
+    def get_compiler_flags():
+        """
+        Get the flags passed to the C++ compiler
+        """
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        flags = config_json.get("compiler-flags")
+        if(type(flags) == list and all(type(flag) == str for flag in flags)):
+            return flags
+        else:
+            flags = Config.repair_config_parameter(config_json, "compiler-flags")
+            return flags
+
+    @staticmethod
+    def get_cache_size():
+        """
+        Get the maximum size of the compiled binaries cache in MiB
+        """
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        size = config_json.get("cache-size")
+        if(type(size) == int and size > 0):
+            return size
+        else:
+            size = Config.repair_config_parameter(config_json, "cache-size")
+            return size
+    
+    @staticmethod   
+    def get_precompiled_header():        
+        """
+        Get if `bits/stdc++.h` is precompiled to speed up compilation
+        """
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        precompiled = config_json.get("precompiled-header")
+        if(type(precompiled) == bool):
+            return precompiled
+        else:
+            precompiled = Config.repair_config_parameter(config_json, "precompiled-header")
+            return precompiled
+    
     @staticmethod   
     def get_test_output():        
         """
@@ -125,6 +174,165 @@ class Config:
             output = Config.repair_config_parameter(config_json, "test-output")
             return output
 
+    @staticmethod   
+    def get_test_stream():        
+        """
+        Get if the test output is compared while the program runs by default
+        """
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        stream = config_json.get("test-stream")
+        if(type(stream) == bool):
+            return stream
+        else:
+            stream = Config.repair_config_parameter(config_json, "test-stream")
+            return stream
+
+    @staticmethod   
+    def get_diff_context():        
+        """
+        Get the number of unchanged lines shown around every difference
+        """
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        context = config_json.get("diff-context")
+        if(type(context) == int and context >= 0):
+            return context
+        else:
+            context = Config.repair_config_parameter(config_json, "diff-context")
+            return context
+
+    @staticmethod   
+    def get_diff_lines():        
+        """
+        Get the maximum number of output lines shown for a test
+        """
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        lines = config_json.get("diff-lines")
+        if(type(lines) == int and lines > 0):
+            return lines
+        else:
+            lines = Config.repair_config_parameter(config_json, "diff-lines")
+            return lines
+
+    @staticmethod   
+    def get_jobs():        
+        """
+        Get the default number of tests that run at the same time
+        """
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        jobs = config_json.get("jobs")
+        if(type(jobs) == int and jobs > 0):
+            return jobs
+        else:
+            jobs = Config.repair_config_parameter(config_json, "jobs")
+            return jobs
+
+    @staticmethod
+    def get_problem_parameter(path: Path, parameter: str, is_valid):
+        """
+        Get a parameter from the config file of a problem folder
+
+        Args:
+            path (Path): Problem folder
+            parameter (str): Parameter name
+            is_valid: Function that checks the parameter value
+
+        Returns:
+            The parameter value or None if the problem doesn't set a valid one
+        """
+        if(path == None):
+            return None
+
+        try:
+            with open(Path(path, Config.problem_config_file), "r") as file:
+                value = json.load(file).get(parameter)
+        except (FileNotFoundError, json.decoder.JSONDecodeError, AttributeError):
+            return None
+
+        return value if is_valid(value) else None
+
+    @staticmethod
+    def get_limit_parameter(path: Path, parameter: str):
+        """
+        Get a positive limit from the problem config or the default config
+        """
+        is_valid = lambda value: type(value) in [int, float] and value > 0
+
+        value = Config.get_problem_parameter(path, parameter, is_valid)
+        if(value != None):
+            return value
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        value = config_json.get(parameter)
+        if(is_valid(value)):
+            return value
+        else:
+            value = Config.repair_config_parameter(config_json, parameter)
+            return value
+
+    @staticmethod
+    def get_time_limit(path: Path = None):
+        """
+        Get the time limit in seconds of a problem
+        """
+        return Config.get_limit_parameter(path, "time-limit")
+
+    @staticmethod
+    def get_memory_limit(path: Path = None):
+        """
+        Get the memory limit in MiB of a problem
+        """
+        return Config.get_limit_parameter(path, "memory-limit")
+
+    @staticmethod
+    def get_output_limit(path: Path = None):
+        """
+        Get the output limit in MiB of a problem
+        """
+        return Config.get_limit_parameter(path, "output-limit")
+
+    @staticmethod
+    def get_comparator(path: Path = None):
+        """
+        Get how the output of a problem is compared, line by line ('lines')
+        or token by token with a tolerance for numbers ('tokens')
+        """
+        choices = ["lines", "tokens"]
+
+        comparator = Config.get_problem_parameter(path, "comparator", lambda value: value in choices)
+        if(comparator != None):
+            return comparator
+
+        Config.repair_config()
+        config_json = Config.get_config_json()
+
+        comparator = config_json.get("comparator")
+        if(comparator in choices):
+            return comparator
+        else:
+            comparator = Config.repair_config_parameter(config_json, "comparator")
+            return comparator
+
+    @staticmethod
+    def get_float_tolerance(path: Path = None):
+        """
+        Get the absolute and relative tolerance of the numbers of a problem output
+        """
+        return Config.get_limit_parameter(path, "float-tolerance")
+
     @staticmethod   
     def get_kattis_name():        
         """
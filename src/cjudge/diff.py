@@ -0,0 +1,222 @@
+import bisect
+
+# Maximum number of edits searched for a middle snake. When two regions
+# differ more than this they are split at the furthest point the search
+# reached, like the heuristic of GNU diff, which keeps completely wrong
+# outputs fast at the cost of a longer diff.
+max_cost = 1024
+
+# The maximum cost is reduced down to `min_cost` for long sequences, so the
+# edits searched over all the regions stay around `max_work`
+min_cost = 16
+max_work = 4 * 1024 * 1024
+
+def diff_lines(lines1: list, lines2: list) -> list:
+    """
+    Get the operations that transform `lines1` into `lines2` using the
+    linear space variant of Myers' diff algorithm. Every operation is a
+    tuple `(op, line)` where `op` is 'S' for lines in both sequences, 'D'
+    for lines only in `lines1` and 'I' for lines only in `lines2`.
+
+    Args:
+        lines1 (list): First sequence of lines
+        lines2 (list): Second sequence of lines
+
+    Returns:
+        list: List of `(op, line)` operations
+    """
+    if(lines1 == lines2):
+        return [('S', line) for line in lines1]
+
+    cost = max(min_cost, min(max_cost, max_work // (len(lines1) + len(lines2))))
+
+    answer = []
+    _diff(lines1, 0, len(lines1), lines2, 0, len(lines2), answer, cost)
+    return answer
+
+def _diff(a, a_lo, a_hi, b, b_lo, b_hi, answer, cost):
+    # The second half of every split is diffed in the loop, so splitting
+    # long sequences doesn't recurse deeply. The common suffixes are added
+    # at the end from the innermost region.
+    suffixes = []
+    while(True):
+        # Common prefix
+        while(a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]):
+            answer.append(('S', a[a_lo]))
+            a_lo += 1
+            b_lo += 1
+
+        # Common suffix
+        suffix = 0
+        while(a_lo < a_hi - suffix and b_lo < b_hi - suffix and a[a_hi - suffix - 1] == b[b_hi - suffix - 1]):
+            suffix += 1
+        a_hi -= suffix
+        b_hi -= suffix
+        suffixes.append((a_hi, suffix))
+
+        snake = None
+        if(a_lo < a_hi and b_lo < b_hi):
+            snake = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, cost)
+
+        if(snake == None):
+            answer.extend(('D', a[i]) for i in range(a_lo, a_hi))
+            answer.extend(('I', b[i]) for i in range(b_lo, b_hi))
+            break
+
+        x, y, u, v = snake
+        _diff(a, a_lo, a_lo + x, b, b_lo, b_lo + y, answer, cost)
+        answer.extend(('S', a[a_lo + i]) for i in range(x, u))
+        a_lo += u
+        b_lo += v
+
+    for a_end, suffix in reversed(suffixes):
+        answer.extend(('S', a[i]) for i in range(a_end, a_end + suffix))
+
+def _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, cost):
+    """
+    Find the snake in the middle of a shortest edit path
+
+    Returns:
+        tuple: Start and end of the snake `(x, y, u, v)` relative to the
+        region, if the region differs more than `cost` an empty snake at
+        the furthest point reached or None if no point was reached
+    """
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta % 2 != 0
+    limit = min((n + m + 1) // 2, cost)
+
+    # Furthest x reached on every diagonal k = x - y, negative k wrap around
+    forward = [0] * (2 * limit + 4)
+    backward = [0] * (2 * limit + 4)
+
+    for d in range(limit + 1):
+        for k in range(-d, d + 1, 2):
+            if(k == -d or (k != d and forward[k - 1] < forward[k + 1])):
+                x = forward[k + 1]
+            else:
+                x = forward[k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while(x < n and y < m and a[a_lo + x] == b[b_lo + y]):
+                x += 1
+                y += 1
+            forward[k] = x
+
+            if(odd and delta - d < k < delta + d and x + backward[delta - k] >= n):
+                return x0, y0, x, y
+
+        for k in range(-d, d + 1, 2):
+            if(k == -d or (k != d and backward[k - 1] < backward[k + 1])):
+                x = backward[k + 1]
+            else:
+                x = backward[k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while(x < n and y < m and a[a_hi - x - 1] == b[b_hi - y - 1]):
+                x += 1
+                y += 1
+            backward[k] = x
+
+            if(not odd and -d <= delta - k <= d and x + forward[delta - k] >= n):
+                return n - x, m - y, n - x0, m - y0
+
+    # Point inside the region furthest from the start of its search
+    best = None
+    best_distance = 0
+    for k in range(-limit, limit + 1, 2):
+        x = forward[k]
+        y = x - k
+        if(x <= n and 0 <= y <= m and x + y > best_distance):
+            best = (x, y)
+            best_distance = x + y
+
+        x = backward[k]
+        y = x - k
+        if(x <= n and 0 <= y <= m and x + y > best_distance):
+            best = (n - x, m - y)
+            best_distance = x + y
+
+    if(best == None or best == (n, m) or best == (0, 0)):
+        return None
+    return *best, *best
+
+def group_hunks(answer: list, context: int) -> list:
+    """
+    Group the differences of a list of operations into hunks, every hunk
+    keeps up to `context` unchanged lines around its differences and hunks
+    that touch each other are merged. Context lines never go past the lines
+    left out of a compressed answer.
+
+    Args:
+        answer (list): List of `(op, line)` operations
+        context (int): Unchanged lines kept before and after every difference
+
+    Returns:
+        list: `(start, end)` ranges of the operations of every hunk
+    """
+    hunks = []
+    skipped = [index for index, (op, _) in enumerate(answer) if op == 'K']
+    for index, (op, _) in enumerate(answer):
+        if(op not in ['D', 'I']):
+            continue
+
+        position = bisect.bisect(skipped, index)
+        first = skipped[position - 1] + 1 if position > 0 else 0
+        last = skipped[position] if position < len(skipped) else len(answer)
+        start = max(first, index - context)
+        end = min(last, index + context + 1)
+        if(len(hunks) > 0 and start <= hunks[-1][1]):
+            hunks[-1] = (hunks[-1][0], end)
+        else:
+            hunks.append((start, end))
+
+    return hunks
+
+def count_lines(op, line) -> tuple:
+    """
+    Get the lines of the program output and of the expected output that an
+    operation stands for, a ('K', count) operation stands for `count`
+    unchanged lines left out of a compressed answer
+    """
+    if(op == 'K'):
+        return line, line
+    return int(op in ['S', 'D']), int(op in ['S', 'I'])
+
+def compress_answer(answer: list, context: int, max_lines: int) -> list:
+    """
+    Get a shorter list of operations that is printed the same way. The
+    unchanged lines outside the hunks are replaced by ('K', count)
+    operations, and answers without differences keep their first
+    `max_lines` lines. Messages are always kept.
+
+    Args:
+        answer (list): List of `(op, line)` operations
+        context (int): Unchanged lines kept before and after every difference
+        max_lines (int): Lines printed of an answer without differences
+
+    Returns:
+        list: Compressed list of operations
+    """
+    hunks = group_hunks(answer, context)
+    if(len(hunks) == 0):
+        rest = answer[max_lines:]
+        hidden = sum(count_lines(op, line)[0] if op == 'K' else op != 'M' for op, line in rest)
+        compressed = answer[:max_lines]
+        if(hidden > 0):
+            compressed.append(('K', hidden))
+        return compressed + [(op, line) for op, line in rest if op == 'M']
+
+    # Every gap between hunks leaves a ('K', count) operation, even an empty
+    # one, so the hunks of the compressed answer don't grow over the messages
+    compressed = []
+    position = 0
+    for start, end in hunks + [(len(answer), len(answer))]:
+        gap = answer[position:start]
+        if(len(gap) > 0):
+            compressed += [(op, line) for op, line in gap if op == 'M']
+            compressed.append(('K', sum(count_lines(op, line)[0] for op, line in gap if op != 'M')))
+        compressed += answer[start:end]
+        position = end
+    return compressed
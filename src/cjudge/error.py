@@ -32,4 +32,16 @@ class CorruptedMetafileError(Exception):
 class CompilationError(Exception):
     """
     Exception raised when a compilation error ocurrs
-    """
\ No newline at end of file
+    """
+
+class ProgramError(Exception):
+    """
+    Exception raised when a helper program like a generator fails
+
+    Attributes:
+        program (str): program name
+    """
+
+    def __init__(self, program: str, msg: str):
+        self.program = program
+        super().__init__(msg)
\ No newline at end of file
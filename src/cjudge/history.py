@@ -0,0 +1,177 @@
+from pathlib import Path
+import sqlite3
+import statistics
+import time
+
+class History():
+    """
+    Results of every test run of a problem saved in the SQLite database
+    `.cjudge/history.db`
+
+    Every run stores the hash of the source it tested, so the results of a
+    test can be compared across the versions of the source. A connection is
+    opened for every operation, so it can be used from any thread.
+    """
+
+    history_file = Path(".cjudge", "history.db")
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            time REAL NOT NULL,
+            source_hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            sample TEXT NOT NULL,
+            verdict TEXT NOT NULL,
+            wall_time REAL,
+            cpu_time REAL,
+            max_rss INTEGER,
+            cached INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS results_sample ON results(sample, run_id);
+        CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+        CREATE INDEX IF NOT EXISTS runs_source ON runs(source_hash, id);
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path): Problem folder
+        """
+        self.path = Path(path, self.history_file)
+
+    def connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.executescript(self.schema)
+        return connection
+
+    def add_run(self, source_hash: str, results: list):
+        """
+        Save a run
+
+        Args:
+            source_hash (str): Hash of the tested source
+            results (list): Sample name, verdict and execution of every test
+        """
+        if(len(results) == 0):
+            return
+
+        connection = self.connect()
+        try:
+            with connection:
+                run_id = connection.execute(
+                    "INSERT INTO runs (time, source_hash) VALUES (?, ?)",
+                    (time.time(), source_hash)
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (run_id, sample, result, execution.wall_time, execution.cpu_time, execution.max_rss, int(getattr(execution, "cached", False)))
+                        for sample, result, execution in results
+                    ]
+                )
+        finally:
+            connection.close()
+
+    def get_last_results(self) -> dict:
+        """
+        Get the last verdict and running time of every test
+
+        Returns:
+            dict: Verdict and wall time of every sample name
+        """
+        if(not self.path.exists()):
+            return {}
+
+        connection = self.connect()
+        try:
+            # The bare columns are taken from the row of the maximum
+            rows = connection.execute(
+                "SELECT sample, verdict, wall_time, MAX(run_id) FROM results GROUP BY sample"
+            ).fetchall()
+        finally:
+            connection.close()
+
+        return {sample: (verdict, wall_time) for sample, verdict, wall_time, _ in rows}
+
+    def get_versions(self, count: int) -> list:
+        """
+        Get the last versions of the source that were tested
+
+        Args:
+            count (int): Maximum number of versions
+
+        Returns:
+            list: Hash and time of the first run of every version, from the oldest to the newest
+        """
+        if(not self.path.exists()):
+            return []
+
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                """
+                SELECT source_hash, MIN(id) AS first_run, MIN(time) FROM runs
+                GROUP BY source_hash ORDER BY first_run DESC LIMIT ?
+                """,
+                (count,)
+            ).fetchall()
+        finally:
+            connection.close()
+
+        return [(source_hash, first_time) for source_hash, _, first_time in reversed(rows)]
+
+    def get_trends(self, versions: list, samples: list = None) -> dict:
+        """
+        Get the results of the tests in some versions of the source, the
+        cached results aren't measurements so they are left out
+
+        Args:
+            versions (list): Source hashes
+            samples (list): Sample names, None for all of them
+
+        Returns:
+            dict: For every sample and source hash a tuple with the last
+                verdict, the median CPU time (the wall time if the CPU time
+                isn't available), the maximum memory and the number of runs
+        """
+        if(len(versions) == 0 or not self.path.exists()):
+            return {}
+
+        query = f"""
+            SELECT results.sample, runs.source_hash, results.verdict,
+                COALESCE(results.cpu_time, results.wall_time), results.max_rss
+            FROM runs JOIN results ON results.run_id = runs.id
+            WHERE runs.source_hash IN ({", ".join("?" * len(versions))}) AND results.cached = 0
+        """
+        parameters = list(versions)
+        if(samples != None):
+            query += f" AND results.sample IN ({", ".join("?" * len(samples))})"
+            parameters += list(samples)
+        query += " ORDER BY runs.id"
+
+        connection = self.connect()
+        try:
+            rows = connection.execute(query, parameters).fetchall()
+        finally:
+            connection.close()
+
+        measures = {}
+        for sample, source_hash, verdict, run_time, max_rss in rows:
+            measure = measures.setdefault(sample, {}).setdefault(source_hash, [None, [], None])
+            measure[0] = verdict
+            if(run_time != None):
+                measure[1].append(run_time)
+            if(max_rss != None):
+                measure[2] = max(max_rss, measure[2] or 0)
+
+        trends = {}
+        for sample, sample_measures in measures.items():
+            trends[sample] = {}
+            for source_hash, (verdict, times, max_rss) in sample_measures.items():
+                median = statistics.median(times) if len(times) > 0 else None
+                trends[sample][source_hash] = (verdict, median, max_rss, len(times))
+        return trends
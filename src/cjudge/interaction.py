@@ -0,0 +1,247 @@
+from pathlib import Path
+import os
+import selectors
+import subprocess
+import tempfile
+
+from .runner import Execution, Limits
+
+# Exit codes of Kattis interactors
+accepted_code = 42
+wrong_answer_code = 43
+
+class Channel():
+    """
+    One direction of an interaction, the bytes read from a program are
+    buffered until the other program can read them
+    """
+
+    def __init__(self, source, destination, op: str):
+        """
+        Args:
+            source: Pipe the bytes are read from
+            destination: Pipe the bytes are written to
+            op (str): Transcript operation of the lines of this channel
+        """
+        self.source = source
+        self.destination = destination
+        self.op = op
+        self.buffer = bytearray()
+        self.line = bytearray()
+        self.size = 0
+        self.closed = False
+
+        os.set_blocking(source.fileno(), False)
+        os.set_blocking(destination.fileno(), False)
+
+    def close(self):
+        self.closed = True
+        self.buffer.clear()
+        try:
+            self.destination.close()
+        except BrokenPipeError:
+            pass
+
+class Interaction():
+    """
+    Session between a solution and a Kattis interactor
+
+    Both programs are connected through pipes, every byte goes through a
+    selector so the conversation is recorded in a transcript. The
+    interactor is run as `interactor <input> <answer> <feedback folder>`.
+
+    Attributes:
+        execution (Execution): Solution execution
+        interactor (Execution): Interactor execution
+        transcript (list): Lines written by the solution ('P') and the interactor ('J')
+        judge_message (str): Feedback written by the interactor
+    """
+
+    max_transcript_lines = 1000
+
+    def __init__(self, solution: Execution, interactor, input_file: Path, answer_file: Path, timeout: float = None):
+        """
+        Args:
+            solution (Execution): Solution started with pipes as standard input and output
+            interactor (Path): Interactor binary
+            input_file (Path): Input given to the interactor
+            answer_file (Path): Answer given to the interactor, None if there is no answer
+            timeout (float): Seconds until the interactor is killed
+        """
+        self.execution = solution
+        self.transcript = []
+        self.judge_message = ""
+
+        # Programs in the order their output finished
+        self.finished = []
+
+        self.feedback_folder = tempfile.TemporaryDirectory()
+        self.stderr = tempfile.TemporaryFile()
+        answer_file = answer_file if answer_file != None else os.devnull
+        try:
+            self.interactor = Execution(
+                [interactor, input_file, answer_file, self.feedback_folder.name + os.sep],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=self.stderr,
+                timeout=timeout, limits=Limits()
+            )
+        except BaseException:
+            solution.kill()
+            solution.wait()
+            self.feedback_folder.cleanup()
+            self.stderr.close()
+            raise
+
+    def add_line(self, op: str, line: bytes):
+        if(len(self.transcript) < self.max_transcript_lines):
+            self.transcript.append((op, line.decode(errors="replace")))
+
+    def read(self, channel: Channel) -> bool:
+        """
+        Read the bytes available in a channel
+
+        Returns:
+            bool: False once the source reached the end
+        """
+        try:
+            data = os.read(channel.source.fileno(), 64 * 1024)
+        except BlockingIOError:
+            return True
+
+        if(data == b""):
+            self.finished.append(channel.op)
+            if(len(channel.line) > 0):
+                self.add_line(channel.op, channel.line)
+                channel.line.clear()
+            return False
+
+        # The output limit of the solution is enforced on the pipe
+        channel.size += len(data)
+        output_limit = self.execution.limits.output
+        if(channel.op == 'P' and output_limit != None and channel.size > output_limit * 1024 * 1024):
+            self.execution.output_exceeded = True
+            self.execution.kill()
+
+        channel.line += data
+        *lines, rest = channel.line.split(b"\n")
+        for line in lines:
+            self.add_line(channel.op, line)
+        channel.line = bytearray(rest)
+
+        if(not channel.closed):
+            channel.buffer += data
+        return True
+
+    def write(self, channel: Channel) -> bool:
+        """
+        Write the buffered bytes of a channel that the destination can take
+
+        Returns:
+            bool: False if the destination was closed by the other program
+        """
+        try:
+            written = os.write(channel.destination.fileno(), channel.buffer)
+            del channel.buffer[:written]
+        except BlockingIOError:
+            pass
+        except BrokenPipeError:
+            return False
+        return True
+
+    def update(self, selector, channel: Channel):
+        """
+        Watch the destination of a channel while it has bytes to write and
+        close it once its source finished and everything was written
+        """
+        if(channel.closed):
+            return
+
+        watching = channel.destination in selector.get_map()
+        finished = channel.source not in selector.get_map() and len(channel.buffer) == 0
+        if(watching and len(channel.buffer) == 0):
+            selector.unregister(channel.destination)
+        elif(not watching and len(channel.buffer) > 0):
+            selector.register(channel.destination, selectors.EVENT_WRITE, channel)
+
+        # A program gets the end of its input once the other one finished
+        if(finished):
+            channel.close()
+
+    def run(self):
+        """
+        Forward the bytes between both programs until they finish
+
+        Returns:
+            Interaction: Finished interaction
+        """
+        channels = [
+            Channel(self.execution.stdout, self.interactor.process.stdin, 'P'),
+            Channel(self.interactor.stdout, self.execution.process.stdin, 'J'),
+        ]
+
+        selector = selectors.DefaultSelector()
+        for channel in channels:
+            selector.register(channel.source, selectors.EVENT_READ, channel)
+
+        try:
+            while(len(selector.get_map()) > 0):
+                for key, _ in selector.select():
+                    channel = key.data
+                    if(key.fileobj == channel.source):
+                        if(not self.read(channel)):
+                            selector.unregister(channel.source)
+                    elif(not self.write(channel)):
+                        # The other program finished, the writer gets a broken pipe
+                        # like it would if both programs were connected directly
+                        selector.unregister(channel.destination)
+                        channel.close()
+                        if(channel.source in selector.get_map()):
+                            selector.unregister(channel.source)
+                            self.finished.append(channel.op)
+                        channel.source.close()
+
+                for channel in channels:
+                    self.update(selector, channel)
+        except BaseException:
+            self.execution.kill()
+            self.interactor.kill()
+            raise
+        finally:
+            selector.close()
+            for channel in channels:
+                if(not channel.closed):
+                    channel.close()
+            self.execution.wait()
+            self.interactor.wait()
+
+            feedback_file = Path(self.feedback_folder.name, "judgemessage.txt")
+            if(feedback_file.exists()):
+                self.judge_message += feedback_file.read_text(errors="replace")
+            self.stderr.seek(0)
+            self.judge_message += self.stderr.read().decode(errors="replace")
+
+            self.feedback_folder.cleanup()
+            self.stderr.close()
+
+        return self
+
+    def get_verdict(self) -> str:
+        """
+        Get the verdict of a finished interaction. A wrong answer given by
+        the interactor before the program finished wins over the program
+        verdict, since the program usually fails after losing its input.
+
+        Returns:
+            str: 'AC', 'WA', 'TLE', 'MLE', 'OLE', 'RTE' or 'JE' if the interactor failed
+        """
+        result = self.execution.get_verdict()
+        code = self.interactor.returncode
+
+        if(code not in [accepted_code, wrong_answer_code] and not self.interactor.timed_out):
+            return "JE"
+        if(code == wrong_answer_code and (result == None or self.finished[0] == 'J')):
+            return "WA"
+        if(result != None):
+            return result
+        if(code == accepted_code):
+            return "AC"
+        return "JE"
@@ -0,0 +1,50 @@
+def split(items: list, n: int) -> list:
+    """Split a list in n chunks of almost the same size"""
+    chunks = []
+    start = 0
+    for i in range(n):
+        end = start + (len(items) - start) // (n - i)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+def ddmin(items: list, is_failing, executor = None, progress = None) -> list:
+    """
+    Reduce a failing list of items with the delta debugging algorithm.
+    The candidates of every step are tested at the same time and the first
+    failing one in order is taken, so the result doesn't depend on timing.
+
+    Args:
+        items (list): Items of the failing input
+        is_failing: Function that checks if a list of items still fails
+        executor: Executor used to test the candidates, None to test them one by one
+        progress: Function called with the current list of items
+
+    Returns:
+        list: A 1-minimal failing list of items
+    """
+    test = executor.map if executor != None else map
+
+    n = 2
+    while(len(items) >= 2):
+        if(progress != None):
+            progress(items)
+
+        n = min(n, len(items))
+        chunks = split(items, n)
+        complements = [[item for j, chunk in enumerate(chunks) if j != i for item in chunk] for i in range(n)]
+
+        # With two chunks every complement is the other chunk
+        candidates = chunks if n == 2 else chunks + complements
+        results = list(test(is_failing, candidates))
+
+        if(True in results):
+            index = results.index(True)
+            items = candidates[index]
+            n = 2 if index < n else max(n - 1, 2)
+        elif(n < len(items)):
+            n = min(2 * n, len(items))
+        else:
+            break
+
+    return items
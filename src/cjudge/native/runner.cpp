@@ -0,0 +1,118 @@
+// Runs a program and writes its resource usage to a file descriptor.
+//
+// The usage can't be measured directly from python because a process
+// spawned by python inherits the peak memory of the interpreter. This
+// runner forks from a small process so the peak memory belongs to the
+// program.
+//
+// Usage: runner <report fd> <cpu seconds> <memory bytes> <output bytes> <program> [arguments...]
+// Limits equal to 0 aren't applied.
+// Report: <wait status> <user seconds> <system seconds> <peak memory KiB>
+
+#include <errno.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+static volatile pid_t child = -1;
+
+// Limits can't be raised over the current hard limit
+static void set_limit(int resource, rlim_t soft, rlim_t hard) {
+    struct rlimit limit;
+    getrlimit(resource, &limit);
+    if(limit.rlim_max != RLIM_INFINITY && hard > limit.rlim_max) {
+        hard = limit.rlim_max;
+    }
+    if(soft > hard) {
+        soft = hard;
+    }
+    limit.rlim_cur = soft;
+    limit.rlim_max = hard;
+    if(setrlimit(resource, &limit) != 0) {
+        perror("setrlimit");
+        _exit(127);
+    }
+}
+
+// SIGTERM kills the program, the runner still reports its usage
+static void kill_child(int) {
+    if(child > 0) {
+        kill(child, SIGKILL);
+    }
+}
+
+int main(int argc, char **argv) {
+    if(argc < 6) {
+        fprintf(stderr, "usage: %s <report fd> <cpu seconds> <memory bytes> <output bytes> <program> [arguments...]\n", argv[0]);
+        return 2;
+    }
+    int report = atoi(argv[1]);
+    rlim_t cpu = strtoull(argv[2], NULL, 10);
+    rlim_t memory = strtoull(argv[3], NULL, 10);
+    rlim_t output = strtoull(argv[4], NULL, 10);
+
+    // SIGTERM is blocked until the child pid is known
+    sigset_t block, previous;
+    sigemptyset(&block);
+    sigaddset(&block, SIGTERM);
+    sigprocmask(SIG_BLOCK, &block, &previous);
+
+    struct sigaction action;
+    memset(&action, 0, sizeof(action));
+    action.sa_handler = kill_child;
+    sigaction(SIGTERM, &action, NULL);
+
+    pid_t pid = fork();
+    if(pid < 0) {
+        perror("fork");
+        return 2;
+    }
+    if(pid == 0) {
+        close(report);
+        signal(SIGTERM, SIG_DFL);
+        sigprocmask(SIG_SETMASK, &previous, NULL);
+
+        // SIGXCPU is sent at the soft limit and SIGKILL at the hard one
+        if(cpu > 0) {
+            set_limit(RLIMIT_CPU, cpu, cpu + 1);
+        }
+        if(memory > 0) {
+            set_limit(RLIMIT_AS, memory, memory);
+            set_limit(RLIMIT_STACK, memory, memory);
+        }
+        // SIGXFSZ is sent when a file grows over the limit
+        if(output > 0) {
+            set_limit(RLIMIT_FSIZE, output, output);
+        }
+
+        execvp(argv[5], argv + 5);
+        perror("exec");
+        _exit(127);
+    }
+    child = pid;
+    sigprocmask(SIG_SETMASK, &previous, NULL);
+
+    // Pipes must only be held by the program so they close when it exits
+    close(STDIN_FILENO);
+    close(STDOUT_FILENO);
+
+    int status;
+    struct rusage usage;
+    while(wait4(pid, &status, 0, &usage) < 0) {
+        if(errno != EINTR) {
+            perror("wait4");
+            return 2;
+        }
+    }
+
+    dprintf(report, "%d %ld.%06ld %ld.%06ld %ld\n", status,
+        (long)usage.ru_utime.tv_sec, (long)usage.ru_utime.tv_usec,
+        (long)usage.ru_stime.tv_sec, (long)usage.ru_stime.tv_usec,
+        (long)usage.ru_maxrss);
+    return 0;
+}
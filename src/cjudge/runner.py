@@ -0,0 +1,439 @@
+from pathlib import Path
+import asyncio
+import math
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from .compiler import Compiler
+from .config import Config
+
+runner_source = Path(Path(__file__).parent, "native", "runner.cpp")
+_runner = None
+_runner_lock = threading.Lock()
+
+# Signals of programs that crash when an allocation fails, std::bad_alloc
+# aborts and unchecked null pointers or stack overflows segfault
+allocation_signals = [signal.SIGABRT, signal.SIGSEGV]
+
+# Fraction of the memory limit a crashed program must have used for the
+# crash to be reported as MLE
+allocation_usage = 0.9
+
+def get_runner() -> Path:
+    """
+    Get the binary that runs programs and measures their resource usage,
+    compiling it the first time or if it was removed from the binary cache
+    """
+    global _runner
+    with _runner_lock:
+        if(_runner == None or not _runner.exists()):
+            _runner = Compiler(flags=["-O2"]).compile(runner_source)
+    return _runner
+
+class Limits():
+    """
+    Resource limits of a program
+
+    Attributes:
+        time (float): CPU time in seconds
+        memory (int): Memory in MiB
+        output (int): Output size in MiB
+    """
+
+    def __init__(self, time: float = None, memory: int = None, output: int = None):
+        self.time = time
+        self.memory = memory
+        self.output = output
+
+    @staticmethod
+    def from_config(path: Path = None):
+        """
+        Get the limits of a problem from its config or the default config
+
+        Args:
+            path (Path): Problem folder
+        """
+        return Limits(Config.get_time_limit(path), Config.get_memory_limit(path), Config.get_output_limit(path))
+
+    @property
+    def timeout(self) -> float:
+        """Real time after which a program is killed, it catches programs that sleep or wait for input"""
+        if(self.time == None):
+            return None
+        return 2 * self.time + 1
+
+    def get_arguments(self) -> list:
+        """Limits passed to the runner, 0 means no limit"""
+        cpu = 0 if self.time == None else math.ceil(self.time)
+        memory = 0 if self.memory == None else int(self.memory * 1024 * 1024)
+        output = 0 if self.output == None else int(self.output * 1024 * 1024)
+        return [str(cpu), str(memory), str(output)]
+
+class Execution():
+    """
+    Program execution that measures the resources used by the program
+
+    Attributes:
+        returncode (int): Exit code, negative if the program was killed by a signal
+        timed_out (bool): True if the program was killed due to the timeout
+        output_exceeded (bool): True if the program wrote more than the output limit to a pipe
+        wall_time (float): Elapsed real time in seconds
+        cpu_time (float): User and system CPU time in seconds
+        max_rss (int): Peak resident memory in KiB
+    """
+
+    def __init__(self, args, stdin = None, stdout = None, timeout: float = None, text: bool = False, limits: Limits = None, stderr = None):
+        """
+        Start a program
+
+        Args:
+            args: Program and arguments
+            stdin: Program standard input
+            stdout: Program standard output
+            timeout (float): Seconds until the program is killed, by default the limits timeout
+            text (bool): Open pipes in text mode
+            limits (Limits): Resource limits of the program
+            stderr: Program standard error
+        """
+        self._init_state(limits, timeout)
+
+        if(not isinstance(args, (list, tuple))):
+            args = [args]
+
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+        if(os.name == "posix"):
+            self._report, report_write = os.pipe()
+            try:
+                self.process = subprocess.Popen([get_runner(), str(report_write), *self.limits.get_arguments(), *args], stdin=stdin, stdout=stdout, stderr=stderr, text=text, pass_fds=(report_write,))
+            except BaseException:
+                os.close(self._report)
+                raise
+            finally:
+                os.close(report_write)
+        else:
+            self.process = subprocess.Popen(args, stdin=stdin, stdout=stdout, stderr=stderr, text=text)
+        self.stdout = self.process.stdout
+
+        self._timer = None
+        if(self.timeout != None):
+            self._timer = threading.Timer(self.timeout, self._timeout)
+            self._timer.start()
+
+    def _init_state(self, limits: Limits, timeout: float):
+        """
+        Set the state of an execution that hasn't started yet
+        """
+        self.returncode = None
+        self.timed_out = False
+        self.output_exceeded = False
+        self.wall_time = None
+        self.cpu_time = None
+        self.max_rss = None
+
+        if(limits == None):
+            limits = Limits()
+        if(timeout == None):
+            timeout = limits.timeout
+        self.limits = limits
+        self.timeout = timeout
+
+        self._finished = False
+        self._report = None
+        self._start = None
+
+    def _timeout(self):
+        self.timed_out = True
+        self.kill()
+
+    def kill(self):
+        """Kill the program if it is still running"""
+        with self._lock:
+            if(self._finished):
+                return
+
+            # The runner kills the program and still reports its usage
+            if(self._report != None):
+                self.process.send_signal(signal.SIGTERM)
+            else:
+                self.process.kill()
+
+    def wait(self):
+        """
+        Wait until the program finishes and get its resource usage
+
+        Returns:
+            Execution: Finished execution
+        """
+        returncode = self.process.wait()
+        self.wall_time = time.perf_counter() - self._start
+
+        with self._lock:
+            self._finished = True
+        if(self._timer != None):
+            self._timer.cancel()
+
+        self.read_usage(returncode)
+
+        if(self.stdout != None):
+            self.stdout.close()
+
+        return self
+
+    def read_usage(self, returncode: int):
+        """
+        Read the resource usage reported by the runner once the program finished
+
+        Args:
+            returncode (int): Exit code of the runner
+        """
+        self.returncode = returncode
+        if(self._report != None):
+            with os.fdopen(self._report, "r") as report:
+                usage = report.read().split()
+
+            if(len(usage) == 4):
+                self.returncode = os.waitstatus_to_exitcode(int(usage[0]))
+                self.cpu_time = float(usage[1]) + float(usage[2])
+
+                # Linux reports KiB and macOS bytes
+                self.max_rss = int(usage[3])
+                if(sys.platform == "darwin"):
+                    self.max_rss //= 1024
+
+    def communicate(self, input: bytes = None) -> bytes:
+        """
+        Send the input to the program and wait until it finishes. The program
+        must have been started with a pipe as standard input, the output is
+        read in chunks if it is a pipe, so the output limit is enforced
+        without storing more than the limit.
+
+        Args:
+            input (bytes): Program input
+
+        Returns:
+            bytes: Program output, None if the output isn't a pipe
+        """
+        chunks = list(self.read_chunks(input))
+        if(self.process.stdout == None):
+            return None
+        return b"".join(chunks)
+
+    def read_chunks(self, input: bytes = None):
+        """
+        Send the input to the program and read its output in chunks until it
+        finishes. The program must have been started with a pipe as standard
+        input, it is killed when the output goes over the output limit or if
+        the chunks stop being read.
+
+        Args:
+            input (bytes): Program input
+
+        Yields:
+            bytes: Chunks of the program output, none if the output isn't a pipe
+        """
+        output_limit = None if self.limits.output == None else int(self.limits.output * 1024 * 1024)
+
+        # The input is written while the output is read so neither pipe fills up
+        def write_input():
+            try:
+                if(input != None):
+                    self.process.stdin.write(input)
+                self.process.stdin.close()
+            except (BrokenPipeError, ValueError):
+                pass
+
+        writer = None
+        if(self.process.stdin != None):
+            writer = threading.Thread(target=write_input, daemon=True)
+            writer.start()
+
+        finished = False
+        try:
+            if(self.process.stdout != None):
+                output_size = 0
+                while(True):
+                    chunk = self.process.stdout.read1(64 * 1024)
+                    if(chunk == b""):
+                        break
+                    output_size += len(chunk)
+                    if(output_limit != None and output_size > output_limit):
+                        self.output_exceeded = True
+                        self.kill()
+                        break
+                    yield chunk
+            finished = True
+        finally:
+            if(not finished):
+                self.kill()
+            self.wait()
+            if(writer != None):
+                writer.join()
+
+    def get_verdict(self) -> str:
+        """
+        Get the verdict of a finished execution from its resource usage
+
+        Returns:
+            str: 'TLE', 'MLE', 'OLE', 'RTE' or None if the program finished correctly
+        """
+        limits = self.limits
+        signal_number = -self.returncode if self.returncode < 0 else None
+
+        if(self.output_exceeded or signal_number == signal.SIGXFSZ):
+            return "OLE"
+
+        if(self.timed_out or signal_number == signal.SIGXCPU):
+            return "TLE"
+        if(limits.time != None and self.cpu_time != None and self.cpu_time > limits.time):
+            return "TLE"
+
+        if(limits.memory != None and self.max_rss != None):
+            memory_limit = limits.memory * 1024
+            if(self.max_rss > memory_limit):
+                return "MLE"
+            # Allocations over the limit fail before the memory is used, an
+            # allocation crash after using most of the memory is most likely one
+            if(signal_number in allocation_signals and self.max_rss >= allocation_usage * memory_limit):
+                return "MLE"
+
+        if(self.returncode != 0):
+            return "RTE"
+        return None
+
+def run(args, stdin = None, stdout = None, timeout: float = None, limits: Limits = None) -> Execution:
+    """
+    Run a program until it finishes
+
+    Returns:
+        Execution: Finished execution
+    """
+    return Execution(args, stdin, stdout, timeout, limits=limits).wait()
+
+class AsyncExecution(Execution):
+    """
+    Program execution for asyncio event loops
+
+    The program starts with `start` and runs with pipes as standard input
+    and output, the output is read in chunks so the output limit is
+    enforced without storing more than the limit.
+    """
+
+    def __init__(self, timeout: float = None, limits: Limits = None):
+        """
+        Args:
+            timeout (float): Seconds until the program is killed, by default the limits timeout
+            limits (Limits): Resource limits of the program
+        """
+        self._init_state(limits, timeout)
+        self.process = None
+
+    async def start(self, args):
+        """
+        Start a program
+
+        Args:
+            args: Program and arguments
+        """
+        if(not isinstance(args, (list, tuple))):
+            args = [args]
+
+        self._start = time.perf_counter()
+        if(os.name == "posix"):
+            self._report, report_write = os.pipe()
+            try:
+                self.process = await asyncio.create_subprocess_exec(
+                    get_runner(), str(report_write), *self.limits.get_arguments(), *args,
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, pass_fds=(report_write,)
+                )
+            except BaseException:
+                os.close(self._report)
+                raise
+            finally:
+                os.close(report_write)
+        else:
+            self.process = await asyncio.create_subprocess_exec(*args, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def kill(self):
+        """Kill the program if it is still running"""
+        if(self._finished or self.process.returncode != None):
+            return
+
+        # The runner kills the program and still reports its usage
+        if(self._report != None):
+            self.process.send_signal(signal.SIGTERM)
+        else:
+            self.process.kill()
+
+    async def wait(self):
+        """
+        Wait until the program finishes and get its resource usage
+
+        Returns:
+            AsyncExecution: Finished execution
+        """
+        returncode = await self.process.wait()
+        self.wall_time = time.perf_counter() - self._start
+        self._finished = True
+
+        self.read_usage(returncode)
+        return self
+
+    async def communicate(self, input: bytes = None) -> bytes:
+        """
+        Send the input to the program and wait until it finishes
+
+        Args:
+            input (bytes): Program input
+
+        Returns:
+            bytes: Program output
+        """
+        output_limit = None if self.limits.output == None else int(self.limits.output * 1024 * 1024)
+
+        async def write_input():
+            try:
+                if(input != None):
+                    self.process.stdin.write(input)
+                    await self.process.stdin.drain()
+                self.process.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        async def read_output():
+            output = bytearray()
+            while(True):
+                chunk = await self.process.stdout.read(64 * 1024)
+                if(chunk == b""):
+                    break
+                output += chunk
+                if(output_limit != None and len(output) > output_limit):
+                    self.output_exceeded = True
+                    self.kill()
+                    break
+            # Programs can close their output and keep running
+            await self.process.wait()
+            return bytes(output)
+
+        writer = asyncio.ensure_future(write_input())
+        try:
+            output = await asyncio.wait_for(read_output(), self.timeout)
+        except TimeoutError:
+            self.timed_out = True
+            self.kill()
+            output = b""
+        except BaseException:
+            # Cancelled tasks don't leave the program running
+            self.kill()
+            writer.cancel()
+            await self.wait()
+            raise
+
+        writer.cancel()
+        await self.wait()
+        return output
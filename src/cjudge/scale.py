@@ -0,0 +1,217 @@
+from pathlib import Path
+import math
+import os
+import shutil
+import statistics
+import subprocess
+
+from .terminal_utils import *
+from .compiler import Compiler
+from .error import ProgramError
+from .runner import run
+from .tester import Tester
+
+# Complexity classes fitted to the running times
+models = [
+    ("O(1)", lambda n: 1),
+    ("O(log N)", lambda n: math.log2(n)),
+    ("O(√N)", lambda n: math.sqrt(n)),
+    ("O(N)", lambda n: n),
+    ("O(N log N)", lambda n: n * math.log2(n)),
+    ("O(N log² N)", lambda n: n * math.log2(n) ** 2),
+    ("O(N√N)", lambda n: n * math.sqrt(n)),
+    ("O(N²)", lambda n: n ** 2),
+    ("O(N² log N)", lambda n: n ** 2 * math.log2(n)),
+    ("O(N³)", lambda n: n ** 3),
+]
+
+# Shortest running time that can be measured
+min_time = 0.001
+
+def fit_model(sizes: list, times: list, function):
+    """
+    Fit `time = a + c * function(size)` minimizing the relative error
+
+    Returns:
+        tuple: Constant overhead `a`, factor `c` and relative RMS error or
+        None if the model can't fit the times
+    """
+    # Times under the resolution of the measurements are rounded up to it
+    times = [max(time, min_time) for time in times]
+
+    # Weighted least squares with weight 1 / time for every point
+    weights = [1 / (time * time) for time in times]
+    values = [function(size) for size in sizes]
+
+    s_w = sum(weights)
+    s_f = sum(w * f for w, f in zip(weights, values))
+    s_ff = sum(w * f * f for w, f in zip(weights, values))
+    s_t = sum(w * t for w, t in zip(weights, times))
+    s_ft = sum(w * f * t for w, f, t in zip(weights, values, times))
+
+    if(s_ff == 0):
+        return None
+
+    # Factor alone, used for constant models and when the overhead is
+    # negative, which is noise
+    a = 0
+    c = s_ft / s_ff
+
+    determinant = s_w * s_ff - s_f * s_f
+    if(determinant > 0):
+        fit_a = (s_ff * s_t - s_f * s_ft) / determinant
+        fit_c = (s_w * s_ft - s_f * s_t) / determinant
+        if(fit_a >= 0):
+            a, c = fit_a, fit_c
+    if(c <= 0):
+        return None
+
+    error = math.sqrt(sum(((a + c * f - t) / t) ** 2 for f, t in zip(values, times)) / len(times))
+    return a, c, error
+
+class ScaleTester(Tester):
+    """
+    Measures the running time of main.cpp on inputs of growing size
+
+    The inputs are created by a generator that receives the seed and the
+    size N as arguments. Generated inputs are kept in the problem folder
+    until the generator changes.
+    """
+
+    def __init__(self, path, generator = None):
+        super().__init__(path, "error", False, 1, stream=False, cache=False, prepare=False)
+        self.generator_file = generator if generator != None else Path(path, "gen.cpp")
+
+        # Only the running time is measured
+        self.checker_file = None
+
+        self.compile_source()
+
+    def compile_source(self):
+        super().compile_source()
+
+        loader = Loader("Compiling generator...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            self.generator = Compiler().compile(self.generator_file)
+        finally:
+            loader.stop()
+
+        # Inputs of older generators are removed
+        inputs_folder = Path(self.path, ".cjudge", "inputs")
+        self.inputs_folder = Path(inputs_folder, self.generator.name)
+        if(inputs_folder.exists()):
+            for folder in inputs_folder.iterdir():
+                if(folder != self.inputs_folder):
+                    shutil.rmtree(folder, ignore_errors=True)
+        self.inputs_folder.mkdir(parents=True, exist_ok=True)
+
+    def generate_input(self, size: int, seed: int) -> Path:
+        """
+        Get the input of a size and seed, generating it if it isn't cached
+        """
+        path = Path(self.inputs_folder, f"{size}-{seed}.in")
+        if(path.exists()):
+            return path
+
+        temporary_path = Path(self.inputs_folder, f".{size}-{seed}.{os.getpid()}")
+        try:
+            with open(temporary_path, "wb") as file:
+                sub = subprocess.run([self.generator, str(seed), str(size)], stdout=file)
+            if(sub.returncode != 0):
+                raise ProgramError(self.generator_file.name, f"'{self.generator_file.name}' crashed with exit code {sub.returncode} for N = {size}")
+            os.replace(temporary_path, path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+        return path
+
+    def measure(self, sizes: list, seeds: int):
+        """
+        Measure the running time of every size until one goes over the time limit
+
+        Returns:
+            tuple: Measured sizes, median CPU time of every size and the verdict that stopped the measure
+        """
+        measured_sizes = []
+        times = []
+        result = None
+
+        loader = Loader("Measuring...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            for size in sizes:
+                size_times = []
+                for seed in range(seeds):
+                    loader.change_description(f"Measuring N = {size} (seed {seed})...")
+                    with open(self.generate_input(size, seed), "rb") as input_file:
+                        execution = run(self.source, stdin=input_file, stdout=subprocess.DEVNULL, limits=self.limits)
+
+                    result = execution.get_verdict()
+                    if(result != None):
+                        break
+                    size_times.append(execution.cpu_time if execution.cpu_time != None else execution.wall_time)
+
+                if(result != None):
+                    break
+
+                measured_sizes.append(size)
+                times.append(statistics.median(size_times))
+        finally:
+            loader.stop()
+
+        return measured_sizes, times, result
+
+    def scale(self, min_size: int, max_size: int, factor: float = 2, seeds: int = 1, limit_size: int = None):
+        """
+        Measure the running time over growing sizes, fit it against common
+        complexities and display an estimation for the maximum size
+
+        Args:
+            min_size (int): First size
+            max_size (int): Last size
+            factor (float): Growth factor between sizes
+            seeds (int): Inputs measured for every size
+            limit_size (int): Maximum size of the problem used for the estimation
+        """
+        sizes = []
+        size = min_size
+        while(size <= max_size):
+            sizes.append(size)
+            size = max(size + 1, round(size * factor))
+
+        measured_sizes, times, result = self.measure(sizes, seeds)
+
+        for size, time in zip(measured_sizes, times):
+            print(f"{bold}N = {size}:{clear} {format_time(time)}")
+        if(result != None):
+            print(f"{bold}N = {sizes[len(measured_sizes)]}:{clear} {bold}{rgb(color_dic[result])}{result}{clear}")
+        print_line()
+
+        if(len(measured_sizes) < 3):
+            display_error("At least 3 sizes are needed to estimate the complexity")
+            return None
+
+        fits = []
+        for name, function in models:
+            fit = fit_model(measured_sizes, times, function)
+            if(fit != None):
+                fits.append((fit[2], name, function, fit[0], fit[1]))
+        fits.sort(key=lambda fit: fit[0])
+
+        if(len(fits) == 0):
+            display_error("None of the complexities fit the running times")
+            return None
+
+        error, name, function, a, c = fits[0]
+        details = f"error {error * 100:.0f}%"
+        if(len(fits) > 1):
+            details += ", next: " + ", ".join(f"{other[1]} {other[0] * 100:.0f}%" for other in fits[1:4])
+        print(f"{bold}Best fit:{clear} {bold}{rgb(Color("#00FFFF"))}{name}{clear} {dim}({details}){clear}")
+
+        if(limit_size != None):
+            estimation = a + c * function(limit_size)
+            color = color_dic["AC"] if estimation <= self.limits.time else color_dic["TLE"]
+            print(f"{bold}Estimated time for N = {limit_size}:{clear} {bold}{rgb(color)}{format_time(estimation)}{clear} {dim}(time limit {format_time(self.limits.time)}){clear}")
+
+        return name
@@ -0,0 +1,134 @@
+from pathlib import Path
+from datetime import datetime
+import argparse
+import sqlite3
+
+from ..history import History
+from ..utils import natural_sort_key
+from ..terminal_utils import *
+from ..error import *
+
+# Differences in running time smaller than this are noise
+min_difference = 0.001
+
+def format_change(before: float, after: float, threshold: float) -> str:
+    """
+    Format the change of the running time between two versions, highlighting
+    the regressions and the improvements greater than the threshold
+    """
+    change = (after - before) / before if before > 0 else 0
+    if(abs(after - before) < min_difference or abs(change) <= threshold):
+        return ""
+    if(change > 0):
+        return f" {bold}{rgb(color_dic["WA"])}▲ +{change * 100:.0f}%{clear}"
+    return f" {bold}{rgb(color_dic["AC"])}▼ {change * 100:.0f}%{clear}"
+
+def cli_history():
+    # Argument parser
+    parser = argparse.ArgumentParser(
+        prog="cjudge-history",
+        description="Show how the running time of every test changed across the versions of 'main.cpp'",
+    )
+
+    parser.add_argument(
+        "path",
+        type=Path,
+        nargs="?",
+        default=Path("."),
+        help="The problem folder"
+    )
+
+    parser.add_argument(
+        "-n", "--versions",
+        type=int,
+        metavar="N",
+        dest="versions",
+        default=5,
+        help="Number of versions of the source shown (Default: 5)"
+    )
+
+    parser.add_argument(
+        "-t", "--test",
+        type=str,
+        metavar="test",
+        dest="tests",
+        action="append",
+        default=None,
+        help="Show only this test, it can be given several times"
+    )
+
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        metavar="R",
+        dest="threshold",
+        default=0.2,
+        help="Relative change of the running time highlighted as a regression or an improvement (Default: 0.2)"
+    )
+
+    args = parser.parse_args()
+    path = args.path
+
+    if(args.versions < 1):
+        display_error("The number of versions must be at least 1")
+        exit()
+
+    if(args.threshold < 0):
+        display_error("The threshold can't be negative")
+        exit()
+
+    if(not path.exists()):
+        display_error("The selected path doesn't exists")
+        exit()
+
+    try:
+        history = History(path)
+        versions = history.get_versions(args.versions)
+        if(len(versions) == 0):
+            display_warning("There are no runs in the history, run 'cjudge-test' first")
+            return
+
+        hashes = [source_hash for source_hash, _ in versions]
+        trends = history.get_trends(hashes, args.tests)
+    except sqlite3.Error as e:
+        display_error(f"Couldn't read the history: {e}")
+        exit()
+
+    for index, (source_hash, first_time) in enumerate(versions, start=1):
+        date = datetime.fromtimestamp(first_time).strftime("%Y-%m-%d %H:%M")
+        print(f"{bold}v{index}{clear} {rgb(Color("#00FFFF"))}{source_hash[:8]}{clear} {dim}first tested {date}{clear}")
+    print_line()
+
+    regressions = []
+    for sample in sorted(trends.keys(), key=natural_sort_key):
+        cells = []
+        previous = None
+        for index, source_hash in enumerate(hashes, start=1):
+            measure = trends[sample].get(source_hash)
+            if(measure == None):
+                cells.append(f"{dim}-{clear}")
+                continue
+
+            verdict, run_time, _, _ = measure
+            if(run_time == None):
+                cells.append(f"{dim}-{clear}")
+                continue
+
+            cell = format_time(run_time)
+            if(verdict not in ["AC", "NI"]):
+                cell += f" {bold}{rgb(color_dic.get(verdict, color_dic["OT"]))}{verdict}{clear}"
+            if(previous != None):
+                change = format_change(previous, run_time, args.threshold)
+                cell += change
+                if(index == len(hashes) and "▲" in change):
+                    regressions.append(f"test {sample} ({format_time(previous)} → {format_time(run_time)})")
+            cells.append(cell)
+            previous = run_time
+
+        print(f"{bold}Test {sample}:{clear} " + f" {dim}→{clear} ".join(cells))
+
+    print_line()
+    if(len(regressions) > 0):
+        print(f"{bold}{rgb(color_dic["WA"])}Regressions in v{len(hashes)}:{clear} " + ", ".join(regressions))
+    else:
+        print(f"{bold}{rgb(color_dic["AC"])}No regressions in v{len(hashes)}{clear}")
@@ -0,0 +1,111 @@
+from pathlib import Path
+import argparse
+
+from ..scale import ScaleTester
+from ..terminal_utils import *
+from ..error import *
+
+def cli_scale():
+    # Argument parser
+    parser = argparse.ArgumentParser(
+        prog="cjudge-scale",
+        description="Estimate the complexity of 'main.cpp' running it on inputs of growing size",
+    )
+
+    parser.add_argument(
+        "path",
+        type=Path,
+        nargs="?",        
+        default=Path("."),
+        help="The problem folder"
+    )
+
+    parser.add_argument(
+        "-g", "--generator",
+        type=Path,
+        metavar="file",
+        dest="generator",
+        default=None,
+        help="Generator that receives the seed and the size N as arguments (Default: 'gen.cpp')"
+    )
+
+    parser.add_argument(
+        "--min",
+        type=int,
+        metavar="N",
+        dest="min_size",
+        default=1000,
+        help="First size (Default: 1000)"
+    )
+
+    parser.add_argument(
+        "--max",
+        type=int,
+        metavar="N",
+        dest="max_size",
+        default=1000000,
+        help="Last size (Default: 1000000)"
+    )
+
+    parser.add_argument(
+        "-f", "--factor",
+        type=float,
+        dest="factor",
+        default=2,
+        help="Growth factor between sizes (Default: 2)"
+    )
+
+    parser.add_argument(
+        "-s", "--seeds",
+        type=int,
+        dest="seeds",
+        default=1,
+        help="Inputs measured for every size (Default: 1)"
+    )
+
+    parser.add_argument(
+        "-l", "--limit",
+        type=int,
+        metavar="N",
+        dest="limit",
+        default=None,
+        help="Maximum N of the problem, used to estimate the time of the worst case"
+    )
+
+    args = parser.parse_args()
+    path = args.path
+    generator = args.generator
+
+    if(args.min_size < 1 or args.max_size < args.min_size):
+        display_error("The sizes must be positive and the maximum must be greater than the minimum")
+        exit()
+
+    if(args.factor <= 1):
+        display_error("The growth factor must be greater than 1")
+        exit()
+
+    if(args.seeds < 1):
+        display_error("The number of seeds must be at least 1")
+        exit()
+
+    if(not path.exists()):
+        display_error("The selected path doesn't exists")
+        exit()
+
+    if(generator != None and not generator.exists()):
+        generator = Path(path, generator)
+
+    try:
+        tester = ScaleTester(path, generator)
+        tester.scale(args.min_size, args.max_size, args.factor, args.seeds, args.limit)
+
+    except CompilationError as e:
+        print(e)
+        display_error("Couldn't compile your program")
+    except ProgramError as e:
+        display_error(str(e))
+    except FileNotFoundError as e:
+        display_error(f"Problem folder '{path}' is not valid")
+        display_warning("Check you have a 'main.cpp' file and a generator")
+    except KeyboardInterrupt:
+        print("")
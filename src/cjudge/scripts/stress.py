@@ -0,0 +1,80 @@
+from pathlib import Path
+import argparse
+
+from ..stress import StressTester
+from ..terminal_utils import *
+from ..error import *
+from ..config import Config
+
+def cli_stress():
+    # Argument parser
+    parser = argparse.ArgumentParser(
+        prog="cjudge-stress",
+        description="Compare 'main.cpp' against 'brute.cpp' on random inputs created by 'gen.cpp'",
+    )
+
+    parser.add_argument(
+        "path",
+        type=Path,
+        nargs="?",        
+        default=Path("."),
+        help="The problem folder"
+    )
+
+    parser.add_argument(
+        "-n", "--number",
+        type=int,
+        metavar="N",
+        dest="number",
+        default=None,
+        help="Maximum number of cases. By default it runs until a case fails"
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        dest="seed",
+        default=0,
+        help="Seed of the first case, 'gen.cpp' receives the seed as its only argument"
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        metavar="N",
+        dest="jobs",
+        default=None,
+        help="Number of cases that run at the same time (Default can be changed on config file)"
+    )
+
+    args = parser.parse_args()
+    path = args.path
+    number = args.number
+    seed = args.seed
+    jobs = args.jobs
+
+    if(jobs == None):
+        jobs = Config.get_jobs()
+
+    if(jobs < 1):
+        display_error("The number of jobs must be at least 1")
+        exit()
+
+    if(not path.exists()):
+        display_error("The selected path doesn't exists")
+        exit()
+
+    try:
+        tester = StressTester(path, jobs)
+        tester.stress(seed, number)
+
+    except CompilationError as e:
+        print(e)
+        display_error("Couldn't compile your program")
+    except ProgramError as e:
+        display_error(str(e))
+    except FileNotFoundError as e:
+        display_error(f"Problem folder '{path}' is not valid")
+        display_warning("Check you have a 'main.cpp', a 'gen.cpp' and a 'brute.cpp' file")
+    except KeyboardInterrupt:
+        print("")
@@ -31,9 +31,18 @@ def cli_submit():
         default=False,
         help="Don't check your program before sending it"
     )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="cache",
+        default=True,
+        help="Run every test before sending your program even if its verdict is cached"
+    )
     args = parser.parse_args()
     path = args.path
     notest = args.notest
+    cache = args.cache
 
     if(not path.exists()):
         display_error("The selected path doesn't exists")
@@ -45,7 +54,7 @@ def cli_submit():
             raise InvalidJudgeException(judge)
 
         if(not notest):
-            tester = Tester(path, "minimal", False)
+            tester = Tester(path, "minimal", False, cache=cache, fail_fast=True)
             _, wa, _ = tester.run_tests()
             if(wa > 0):
                 display_error("Your program didn't pass all test cases")
@@ -39,6 +39,52 @@ def cli_test():
         help="Run an interactive test case"
     )
 
+    parser.add_argument(
+        "--interactor",
+        type=Path,
+        metavar="file",
+        dest="interactor",
+        default=None,
+        help="Interactor of an interactive problem, it receives the sample input and answer files and exits with 42 if the program is correct or 43 otherwise"
+    )
+
+    parser.add_argument(
+        "-c", "--checker",
+        type=Path,
+        metavar="file",
+        dest="checker",
+        default=None,
+        help="Testlib checker of a problem with several valid answers, it receives the sample input, your output and the answer files (Default: 'checker.cpp' if it exists)"
+    )
+
+    parser.add_argument(
+        "--comparator",
+        type=str,
+        metavar="choice",
+        dest="comparator",
+        choices=["lines", "tokens"],
+        default=None,
+        help="How outputs are compared. lines: Line by line. tokens: Token by token, numbers match within --eps. (Default can be changed on the problem or config file)"
+    )
+
+    parser.add_argument(
+        "--eps",
+        type=float,
+        metavar="E",
+        dest="tolerance",
+        default=None,
+        help="Absolute and relative tolerance of the numbers compared by the tokens comparator (Default can be changed on the problem or config file)"
+    )
+
+    parser.add_argument(
+        "--samples",
+        type=Path,
+        metavar="source",
+        dest="samples",
+        default=None,
+        help="Folder or zip/tar archive with the test cases, archives are read without extracting them (Default: 'samples' folder)"
+    )
+
     parser.add_argument(
         "-nf", "--nofile",
         action="store_false",
@@ -47,26 +93,192 @@ def cli_test():
         help="Doesn't create result files"
     )
 
+    parser.add_argument(
+        "-f", "--fail-fast",
+        action="store_true",
+        dest="fail_fast",
+        default=False,
+        help="Stop on the first failed test, the tests that failed last time and the fastest ones run first"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="cache",
+        default=True,
+        help="Run every test even if its verdict is cached"
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        metavar="N",
+        dest="jobs",
+        default=None,
+        help="Number of tests that run at the same time (Default can be changed on config file)"
+    )
+
+    parser.add_argument(
+        "-s", "--stream",
+        action="store_true",
+        dest="stream",
+        default=None,
+        help="Compare the output while the program runs and stop it on the first incorrect line (Default can be changed on config file)"
+    )
+
+    parser.add_argument(
+        "-w", "--watch",
+        action="store_true",
+        dest="watch",
+        default=False,
+        help="Run the tests again every time 'main.cpp' or a sample changes"
+    )
+
+    parser.add_argument(
+        "-b", "--bench",
+        type=int,
+        metavar="R",
+        dest="bench",
+        default=None,
+        help="Run every test R times after a warm-up run and display statistics of its running time"
+    )
+
+    parser.add_argument(
+        "--compare",
+        type=str,
+        metavar="version",
+        dest="compare",
+        default=None,
+        help="Compare the running time with another version of the solution, a source file or a git revision like HEAD. Every version runs R times on every test, R is given by --bench (Default: 10)"
+    )
+
+    parser.add_argument(
+        "--oracle",
+        type=Path,
+        metavar="file",
+        dest="oracle",
+        default=None,
+        help="Reference solution that generates the missing expected outputs before the tests run"
+    )
+
+    parser.add_argument(
+        "-m", "--minimize",
+        type=str,
+        metavar="test",
+        dest="minimize",
+        default=None,
+        help="Shrink the input of a failing test while it keeps failing"
+    )
+
+    parser.add_argument(
+        "-r", "--reference",
+        type=Path,
+        metavar="file",
+        dest="reference",
+        default=None,
+        help="Reference solution used by --minimize to check the output (Default: 'brute.cpp' if it exists)"
+    )
+
     args = parser.parse_args()
     output = args.output
     interactive = args.interactive
     create_files = args.create_files
+    jobs = args.jobs
+    stream = args.stream
+    watch = args.watch
+    interactor = args.interactor
+    checker = args.checker
+    comparator = args.comparator
+    tolerance = args.tolerance
+    samples = args.samples
+    cache = args.cache
+    fail_fast = args.fail_fast
+    compare = args.compare
+    oracle = args.oracle
+    bench = args.bench
+    minimize = args.minimize
+    reference = args.reference
     path = args.path
 
     if(output == None):
         output = Config.get_test_output()
 
+    if(jobs == None):
+        jobs = Config.get_jobs()
+
+    if(jobs < 1):
+        display_error("The number of jobs must be at least 1")
+        exit()
+
+    if(tolerance != None and tolerance <= 0):
+        display_error("The tolerance must be positive")
+        exit()
+
+    if(bench != None and bench < 1):
+        display_error("The number of benchmark runs must be at least 1")
+        exit()
+
     if(not path.exists()):
         display_error("The selected path doesn't exists")
         exit()
 
+    if(interactor != None and not interactor.exists()):
+        interactor = Path(path, interactor)
+
+    if(samples != None and not samples.exists()):
+        samples = Path(path, samples)
+
+    if(samples != None and samples.is_file() and minimize != None):
+        display_error("Tests of an archive can't be minimized")
+        exit()
+
+    if(samples != None and samples.is_file() and oracle != None):
+        display_error("Expected outputs can't be written into an archive")
+        exit()
+
+    if(oracle != None and not oracle.exists()):
+        oracle = Path(path, oracle)
+
+    # A compared version that isn't a file is a git revision
+    if(compare != None and Path(compare).is_file()):
+        compare = Path(compare)
+    elif(compare != None and Path(path, compare).is_file()):
+        compare = Path(path, compare)
+
+    if(checker != None and not checker.exists()):
+        checker = Path(path, checker)
+
     try:
-        tester = Tester(path, output, create_files)
-        tester.run_tests()
+        tester = Tester(path, output, create_files, jobs, stream, interactor, checker, comparator, tolerance, samples, cache, fail_fast, compare)
+        if(oracle != None):
+            tester.generate_outputs(oracle)
+        if(compare != None):
+            tester.compare(bench if bench != None else 10)
+        elif(bench != None):
+            tester.benchmark(bench)
+        elif(minimize != None):
+            if(reference == None and Path(path, "brute.cpp").exists()):
+                reference = Path(path, "brute.cpp")
+            elif(reference != None and not reference.exists()):
+                reference = Path(path, reference)
+            tester.minimize(minimize, reference)
+        elif(interactive):
+            tester.run_interactive()
+        elif(watch):
+            tester.watch()
+        else:
+            tester.run_tests()
 
     except CompilationError as e:
         print(e)
         display_error("Couldn't compile your program")
+    except ProgramError as e:
+        display_error(str(e))
     except FileNotFoundError as e:
-        display_error(f"Problem folder '{path}' is not valid")
-        display_warning("Check you have a 'samples' folder and a 'main.cpp' file")
+        if(samples != None and samples.is_file()):
+            display_error(str(e))
+        else:
+            display_error(f"Problem folder '{path}' is not valid")
+            display_warning("Check you have a 'samples' folder and a 'main.cpp' file")
+    except KeyboardInterrupt:
+        print("")
@@ -0,0 +1,169 @@
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import itertools
+import subprocess
+import time
+
+from .terminal_utils import *
+from .comparator import open_output
+from .compiler import Compiler
+from .error import ProgramError
+from .tester import Tester
+
+class StressTester(Tester):
+    """
+    Compares main.cpp against a brute force solution on random inputs
+
+    The inputs are created by `gen.cpp`, which receives the seed as its
+    only argument and prints the input. Every program runs through pipes,
+    so passing cases never touch the disk.
+    """
+
+    def __init__(self, path, jobs = None):
+        super().__init__(path, "error", False, jobs, stream=False, cache=False, prepare=False)
+        self.generator_file = Path(path, "gen.cpp")
+        self.brute_file = Path(path, "brute.cpp")
+
+        # Outputs are compared with the output of the brute force solution
+        self.checker_file = None
+
+        self.compile_source()
+
+    def compile_source(self):
+        super().compile_source()
+
+        loader = Loader("Compiling generator and brute force...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            compiler = Compiler()
+            self.generator = compiler.compile(self.generator_file)
+            self.brute = compiler.compile(self.brute_file)
+        finally:
+            loader.stop()
+
+    def run_helper(self, name, args, input = None) -> bytes:
+        """
+        Run the generator or the brute force solution and get its output
+        """
+        # Helper programs are allowed to be slower than the solution
+        timeout = 10 * self.limits.timeout
+        try:
+            sub = subprocess.run(args, input=input, capture_output=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ProgramError(name, f"'{name}' ran out of time")
+
+        if(sub.returncode != 0):
+            raise ProgramError(name, f"'{name}' crashed with exit code {sub.returncode}")
+        return sub.stdout
+
+    def run_case(self, seed):
+        """
+        Run a random case
+
+        Returns:
+            tuple: Seed, input, expected output, output and verdict of the case
+        """
+        input = self.run_helper("gen.cpp", [self.generator, str(seed)])
+        expected = self.run_helper("brute.cpp", [self.brute], input)
+
+        execution, output = self.run_input(input)
+
+        result = execution.get_verdict()
+        if(result == None):
+            result = "AC" if self.outputs_match(output, expected) else "WA"
+
+        return seed, input, expected, output, result
+
+    def run_stress(self, first_seed = 0, count = None):
+        """
+        Run random cases until one fails
+
+        Args:
+            first_seed (int): Seed of the first case
+            count (int): Maximum number of cases, None to run until one fails
+
+        Returns:
+            tuple: The failed case as returned by `run_case` or None
+        """
+        seeds = itertools.count(first_seed) if count == None else iter(range(first_seed, first_seed + count))
+        failed = None
+        done = 0
+        start = time.perf_counter()
+
+        loader = Loader("Running random cases...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                # Keep a few cases queued for every worker
+                pending = set()
+                for seed in itertools.islice(seeds, 4 * self.jobs):
+                    pending.add(executor.submit(self.run_case, seed))
+
+                while(len(pending) > 0):
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if(future.cancelled()):
+                            continue
+                        case = future.result()
+                        done += 1
+                        if(case[4] != "AC" and (failed == None or case[0] < failed[0])):
+                            failed = case
+
+                    if(failed != None):
+                        # Cases already running may have a smaller failing seed
+                        for future in pending:
+                            future.cancel()
+                        continue
+
+                    for seed in itertools.islice(seeds, len(finished)):
+                        pending.add(executor.submit(self.run_case, seed))
+
+                    speed = done / (time.perf_counter() - start)
+                    loader.change_description(f"Running random cases ({done} passed, {speed:.0f} cases/s)...")
+        finally:
+            loader.stop()
+
+        return failed, done
+
+    def save_case(self, case) -> str:
+        """
+        Save a failed case as a new sample
+
+        Returns:
+            str: Sample name
+        """
+        seed, input, expected, _, _ = case
+        sample = f"stress-{seed}"
+
+        self.sample_folder.mkdir(exist_ok=True)
+        with open(Path(self.sample_folder, f"{sample}.in"), "wb") as file:
+            file.write(input)
+        with open(Path(self.sample_folder, f"{sample}.out"), "wb") as file:
+            file.write(expected)
+
+        return sample
+
+    def stress(self, first_seed = 0, count = None):
+        """
+        Run random cases until one fails and display the failed case
+        """
+        failed, done = self.run_stress(first_seed, count)
+
+        if(failed == None):
+            print(f"{bold}Stress:{clear} {rgb(color_dic["AC"])}{bold}{done} cases passed {check}")
+            return None
+
+        seed, _, expected, output, result = failed
+        sample = self.save_case(failed)
+
+        print(f"{bold}Case with seed {seed}: {rgb(color_dic["WA"])}FAILED {cross}")
+        if(result == "WA"):
+            _, answer = self.compare_outputs(open_output(output), open_output(expected))
+            self.print_answer(answer)
+            print(f"  Your output is incorrect {bold}{rgb(color_dic[result])}{result}{clear}")
+        else:
+            print(f"  Your program failed {bold}{rgb(color_dic[result])}{result}{clear}")
+        print_line()
+        print(f"{bold}Saved as test {sample}{clear} in '{self.sample_folder}'")
+
+        return sample
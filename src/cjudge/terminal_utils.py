@@ -67,9 +67,11 @@ color_dic = {
     'TL':Color('#F3B74D'),
     'MLE':Color('#75A9D4'),
     'ML':Color('#75A9D4'),
+    'OLE':Color('#FF9966'),
     'CE':Color('#C45A9C'),
     'PE':Color('#FF9966'),
     'RTE':Color('#9972CC'),
+    'JE':Color('#B0B0B0'),
     'OT':Color('#000000')
 }
 
@@ -83,10 +85,35 @@ veredict_dict = {
     "RTE": "Run-Time Error",
     "OT": "Other",
     "TL": "Time limit Exceeded",
-    "MLE": "Memory limit Exceeded"
+    "MLE": "Memory limit Exceeded",
+    "OLE": "Output limit Exceeded",
+    "JE": "Judge Error"
 
 }
 
+def format_time(seconds: float) -> str:
+    """Format a duration in seconds"""
+    if(seconds < 0.01):
+        return f"{seconds * 1000:.2f}ms"
+    if(seconds < 1):
+        return f"{seconds * 1000:.0f}ms"
+    return f"{seconds:.2f}s"
+
+def format_memory(kib: int) -> str:
+    """Format an amount of memory in KiB"""
+    if(kib < 1024):
+        return f"{kib}KiB"
+    return f"{kib / 1024:.1f}MiB"
+
+def format_usage(execution) -> str:
+    """Format the time and memory used by a program execution"""
+    usage = [f"wall {format_time(execution.wall_time)}"]
+    if(execution.cpu_time != None):
+        usage.append(f"cpu {format_time(execution.cpu_time)}")
+    if(execution.max_rss != None):
+        usage.append(f"mem {format_memory(execution.max_rss)}")
+    return " · ".join(usage)
+
 def print_line():
     print(min(get_terminal_size().columns, 113) * "─")
 
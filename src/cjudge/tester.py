@@ -1,51 +1,231 @@
 from pathlib import Path
-import re
+import codecs
+import contextlib
+import hashlib
+import io
+import math
+import os
+import selectors
+import sqlite3
 import subprocess
+import sys
 import tempfile
 import threading
-import time
-import queue
+import statistics
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 from .terminal_utils import *
+from .archive import SampleArchive
+from .cache import BinaryCache
 from .config import Config
-from .error import CompilationError
+from .error import CompilationError, ProgramError
+from .compiler import Compiler
+from .comparator import compare_tokens, open_output
+from .diff import compress_answer, count_lines, diff_lines, group_hunks
+from .history import History
+from .interaction import Interaction
+from .minimize import ddmin
+from .runner import Execution, Limits, get_runner, run
+from .utils import natural_sort_key
+from .verdict_cache import VerdictCache
+from .watcher import create_watcher
+
+# Two-sided 95% quantiles of Student's t distribution by degrees of freedom,
+# the ones in between use the next smaller degrees of freedom
+t_quantiles = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145,
+    15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 21: 2.080,
+    22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048,
+    29: 2.045, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
 
 class Tester():
-    def __init__(self, path, output, create_files):
+    # Verdicts of testlib checker exit codes
+    checker_verdicts = {0: "AC", 1: "WA", 2: "PE"}
+
+    def __init__(self, path, output, create_files, jobs = None, stream = None, interactor = None, checker = None, comparator = None, tolerance = None, samples = None, cache = True, fail_fast = False, compare = None, prepare = True):
+        self.path = path
         self.cpp_file = Path(path, "main.cpp")
-        self.sample_folder = Path(path, "samples")
-        self.temporary_path = tempfile.TemporaryDirectory()
+        self.sample_folder = Path(path, "samples") if samples == None else Path(samples)
+        self.limits = Limits.from_config(path)
+
+        # Interactor source of interactive problems
+        self.interactor_file = interactor
+
+        # Checker source of problems with several valid answers, by default
+        # 'checker.cpp' if it exists
+        self.checker_file = checker
+        if(checker == None and Path(path, "checker.cpp").exists()):
+            self.checker_file = Path(path, "checker.cpp")
+
+        # Outputs are compared line by line ('lines') or token by token ('tokens')
+        self.comparator = comparator if comparator != None else Config.get_comparator(path)
+        self.tolerance = tolerance if tolerance != None else Config.get_float_tolerance(path)
 
         self.output_type = output
         self.create_files = create_files
+        self.jobs = jobs if jobs != None else Config.get_jobs()
+        self.stream = stream if stream != None else Config.get_test_stream()
+
+        # Zip or tar archive the samples are read from instead of the
+        # samples folder, result files can't be saved inside it
+        self.archive = None
+        if(self.sample_folder.is_file()):
+            self.archive = SampleArchive(self.sample_folder)
+            self.create_files = False
+
+        # Verdicts of the tests that already ran, None if they aren't cached
+        self.verdict_cache = VerdictCache(path) if cache else None
+
+        # Results of the previous runs
+        self.history = History(path)
+
+        # Stop the run on the first test that fails
+        self.fail_fast = fail_fast
 
+        # Version of the source compared with it, a source file or a git revision
+        self.compare_version = compare
+
+        # Running tests are killed when the run is cancelled or stopped
+        # by a failed test
+        self.cancelled = threading.Event()
+        self.stopped = threading.Event()
+        self.executions = weakref.WeakSet()
+        self.executions_lock = threading.Lock()
+
+        # Inputs are read in the background while the source compiles, the
+        # expected outputs are read from the disk when they are compared
+        self.prefetched = {}
+        self.prefetch_lock = threading.Lock()
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=1)
+
+        # Outputs are checked while the next tests run
+        self.checker_executor = ThreadPoolExecutor(max_workers=self.jobs)
+
+        # Subclasses that don't test the samples compile what they need on their own
+        if(not prepare):
+            return
+
+        samples_future = self.prefetch_executor.submit(self.load_samples)
         self.compile_source()
+        samples_future.result()
+
+    def load_samples(self):
+        """
+        Scan the samples folder and prefetch the inputs of the first samples to run
+        """
         self.get_samples()
+        for _, sample in self.samples[:self.jobs + 1]:
+            self.prefetch_input(sample)
+
+    def read_input(self, sample) -> bytes:
+        """
+        Read the input of a sample
+        """
+        if(self.archive != None):
+            return self.archive.read_input(sample)
+
+        with open(Path(self.sample_folder, f"{sample}.in"), "rb") as file:
+            return file.read()
+
+    def prefetch_input(self, sample):
+        """
+        Start reading the input of a sample in the background if it isn't being read yet
+        """
+        with self.prefetch_lock:
+            if(sample not in self.prefetched):
+                self.prefetched[sample] = self.prefetch_executor.submit(self.read_input, sample)
+
+    def get_input(self, sample) -> bytes:
+        """
+        Get an input prefetched by `prefetch_input` or read it if it wasn't
+        """
+        with self.prefetch_lock:
+            future = self.prefetched.pop(sample, None)
+
+        if(future != None):
+            try:
+                return future.result()
+            except OSError:
+                # The sample changed while it was prefetched
+                pass
+        return self.read_input(sample)
+
+    def open_expected_binary(self, sample):
+        """
+        Open the expected output of a sample as a binary file, outputs of an
+        archive are read in place
+        """
+        if(self.archive == None):
+            return open(Path(self.sample_folder, f"{sample}.out"), "rb")
+        return self.archive.open_output(sample)
+
+    @contextlib.contextmanager
+    def open_expected(self, sample):
+        """
+        Open the expected output of a sample as a text file read from the
+        disk
+        """
+        with self.open_expected_binary(sample) as file, io.TextIOWrapper(file, encoding="utf-8", errors="replace", newline=None) as text_file:
+            yield text_file
+
+    @contextlib.contextmanager
+    def sample_files(self, sample, full):
+        """
+        Get the paths of the input and the expected output of a sample for
+        programs that read them by name. Samples of an archive are written
+        to temporary files that are removed afterwards.
+
+        Yields:
+            tuple: Input path and expected output path, None if the sample has no output
+        """
+        if(self.archive == None):
+            yield Path(self.sample_folder, f"{sample}.in"), Path(self.sample_folder, f"{sample}.out") if full else None
+            return
+
+        with tempfile.TemporaryDirectory() as folder:
+            input_file = Path(folder, "input.in")
+            with open(input_file, "wb") as file:
+                self.archive.copy(self.archive.inputs[sample], file)
+
+            answer_file = None
+            if(full):
+                answer_file = Path(folder, "answer.out")
+                with open(answer_file, "wb") as file:
+                    self.archive.copy(self.archive.outputs[sample], file)
+            yield input_file, answer_file
 
     def get_samples(self):
         if(not self.sample_folder.exists()):
             raise FileNotFoundError
         
+        with self.prefetch_lock:
+            self.prefetched.clear()
+
         input_set = set()
         output_set = set()
 
-        for file in self.sample_folder.iterdir():
-            name = file.stem
-            suffix = file.suffix
-            
-            if(suffix == ".in"):
-                input_set.add(name)
-            elif(suffix == ".out"):
-                output_set.add(name)
+        if(self.archive != None):
+            input_set = set(self.archive.inputs)
+            output_set = set(self.archive.outputs)
+        else:
+            for file in self.sample_folder.iterdir():
+                name = file.stem
+                suffix = file.suffix
+                
+                if(suffix == ".in"):
+                    input_set.add(name)
+                elif(suffix == ".out"):
+                    output_set.add(name)
 
         full_samples = list(input_set.intersection(output_set))
         half_samples = list(input_set.difference(output_set))
 
-        regex = re.compile(r'(\d+)')
-        sort_function = lambda l: [int(s) if s.isdigit() else s.lower() for s in re.split(regex, l)]
-
-        full_samples.sort(key=sort_function)
-        half_samples.sort(key=sort_function)
+        full_samples.sort(key=natural_sort_key)
+        half_samples.sort(key=natural_sort_key)
 
         self.samples = []
         for sample in full_samples:
@@ -57,178 +237,735 @@ class Tester():
         loader = Loader("Compiling source...", end_description="", color=Color("#00FFFF"))
         loader.start()
         try:
-            self.source = Path(self.temporary_path.name, "main")
-            compiler = Config.get_compiler()
-
             if(not self.cpp_file.exists()):
                 raise FileNotFoundError("Couldn't find problem file")
 
-            sub = subprocess.run([compiler, "-o", self.source, self.cpp_file], capture_output=True) 
-            if sub.returncode != 0:
-                raise CompilationError(sub.stderr.decode())
+            # Both versions compile at the same time
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                compare_future = None
+                if(self.compare_version != None):
+                    compare_future = executor.submit(self.compile_compare_version)
+
+                self.source = Compiler().compile(self.cpp_file)
+                self.source_hash = BinaryCache.get_key(self.cpp_file.read_bytes())
+                if(compare_future != None):
+                    loader.change_description("Compiling compared version...")
+                    self.compare_binary = compare_future.result()
+
+            if(self.interactor_file != None):
+                loader.change_description("Compiling interactor...")
+                self.interactor = Compiler().compile(self.interactor_file)
+            if(self.checker_file != None):
+                loader.change_description("Compiling checker...")
+                self.checker = Compiler().compile(self.checker_file)
+            # Programs only run through the runner on POSIX systems
+            if(os.name == "posix"):
+                get_runner()
 
         finally:
             loader.stop()
 
+    def compile_compare_version(self) -> Path:
+        """
+        Compile the version compared with the source, a git revision is
+        written to a temporary file
+
+        Raises:
+            ProgramError: If git can't get the source of the revision
+        """
+        if(isinstance(self.compare_version, Path)):
+            return Compiler().compile(self.compare_version)
+
+        try:
+            sub = subprocess.run(["git", "show", f"{self.compare_version}:./{self.cpp_file.name}"], cwd=self.path, capture_output=True)
+        except FileNotFoundError:
+            raise ProgramError("git", "Couldn't find git")
+        if(sub.returncode != 0):
+            raise ProgramError("git", f"Couldn't get '{self.cpp_file.name}' from git revision '{self.compare_version}'")
+
+        with tempfile.TemporaryDirectory() as folder:
+            cpp_file = Path(folder, self.cpp_file.name)
+            cpp_file.write_bytes(sub.stdout)
+            return Compiler().compile(cpp_file)
+
+    def start_execution(self, stdin, stdout, text = False) -> Execution:
+        """
+        Start the compiled source, it is killed right away if the run was cancelled
+        """
+        execution = Execution(self.source, stdin=stdin, stdout=stdout, text=text, limits=self.limits)
+        self.add_execution(execution)
+        return execution
+
+    def add_execution(self, execution):
+        """
+        Keep track of a running program so it is killed if the run is
+        cancelled or stopped, it is killed right away if it already was
+        """
+        with self.executions_lock:
+            self.executions.add(execution)
+            if(self.cancelled.is_set() or self.stopped.is_set()):
+                execution.kill()
+
+    def cancel(self):
+        """
+        Cancel the run, killing the tests that are running
+        """
+        with self.executions_lock:
+            self.cancelled.set()
+            for execution in list(self.executions):
+                execution.kill()
+
+    def stop(self):
+        """
+        Stop the run after a failed test, the tests that are running are
+        killed but the finished ones are still shown
+        """
+        with self.executions_lock:
+            self.stopped.set()
+            for execution in list(self.executions):
+                execution.kill()
+
+    def start_sample(self, sample, full) -> Future:
+        """
+        Run a sample and start checking its output. With a checker the
+        output is checked in the background so the next test can run.
+        Samples whose verdict is cached don't run.
+
+        Returns:
+            Future: Verdict, answer and execution of the test
+        """
+        key = None
+        if(self.verdict_cache != None):
+            key = self.get_cache_key(sample, full)
+            cached = self.verdict_cache.get(key)
+            if(cached != None):
+                # The prefetched input isn't needed anymore
+                with self.prefetch_lock:
+                    self.prefetched.pop(sample, None)
+
+                future = Future()
+                future.set_result(cached)
+                return future
+
+        if(self.checker_file != None and self.interactor_file == None and full):
+            future = self.check_sample(sample)
+        else:
+            future = Future()
+            future.set_result(self.test_sample(sample, full))
+
+        if(key != None):
+            future.add_done_callback(lambda future: self.cache_verdict(key, future))
+        return future
+
+    def get_cache_key(self, sample, full) -> str:
+        """
+        Get the verdict cache key of a sample, it changes with the binaries,
+        the sample, the limits and how the output is compared and read
+        """
+        # The prefetched input is left for the test in case it isn't cached
+        self.prefetch_input(sample)
+        with self.prefetch_lock:
+            future = self.prefetched.get(sample)
+        try:
+            input = future.result() if future != None else self.read_input(sample)
+        except OSError:
+            input = self.read_input(sample)
+
+        binaries = [self.source.name]
+        if(self.interactor_file != None):
+            binaries.append(f"interactor {self.interactor.name}")
+        elif(self.checker_file != None):
+            binaries.append(f"checker {self.checker.name}")
+        else:
+            binaries.append(f"comparator {self.comparator} {self.tolerance}")
+
+        # The expected output is hashed in chunks from the disk
+        expected = b""
+        if(full):
+            with self.open_expected_binary(sample) as file:
+                expected = hashlib.file_digest(file, "sha256").digest()
+
+        # The runner rounds the CPU limit up, the exact limits change the verdict
+        limits = f"{self.limits.time} {self.limits.memory} {self.limits.output}"
+        return BinaryCache.get_key(*binaries, limits, input, expected, str(full), f"stream {self.stream}")
+
+    def cache_verdict(self, key, future):
+        """
+        Cache the verdict of a finished test. Tests killed by a cancelled
+        run and judge errors aren't cached.
+        """
+        if(self.cancelled.is_set() or self.stopped.is_set() or future.cancelled() or future.exception() != None):
+            return
+
+        result, answer, execution = future.result()
+        if(result == "JE"):
+            return
+
+        # Only the lines that can be printed are cached
+        if(answer != None):
+            answer = compress_answer(answer, Config.get_diff_context(), Config.get_diff_lines())
+        self.verdict_cache.put(key, result, answer, execution)
+
     def test_sample(self, sample, full):
+        if(self.interactor_file != None):
+            return self.interact_sample(sample, full)
+        if(self.checker_file != None and full):
+            return self.check_sample(sample).result()
+        if(full and self.stream and self.comparator == "lines"):
+            return self.stream_sample(sample)
+
         result = None
         answer = None
 
-        input_file = open(Path(self.sample_folder, f"{sample}.in"), "r")
+        input = self.get_input(sample)
         
         if self.create_files:
             result_file = open(Path(self.sample_folder, f"{sample}.res"), "w+")
         else:
             result_file = tempfile.TemporaryFile("w+")
 
-        if(full):
-            output_file = open(Path(self.sample_folder, f"{sample}.out"), "r")
-
-            try:
-                sub = subprocess.run(self.source, stdin=input_file, stdout=result_file, timeout=3)
-            except subprocess.TimeoutExpired:
-                result = "TLE"
-            else:
-                if(sub.returncode != 0):
-                    result = "RTE"
+        execution = self.start_execution(subprocess.PIPE, result_file)
+        execution.communicate(input)
+        result = execution.get_verdict()
 
+        if(full):
             if(result == None):
                 result_file.seek(0)
-                is_correct_answer, answer = self.compare_files(result_file, output_file)
+                with self.open_expected(sample) as output_file:
+                    is_correct_answer, answer = self.compare_outputs(result_file, output_file)
                 if(is_correct_answer):
                     result = "AC"
                 else:
                     result = "WA"
-                
-            output_file.close()  
         else:
-            result = "NI"
-            try:
-                sub = subprocess.run(self.source, stdin=input_file, stdout=result_file, timeout=3)
-            except subprocess.TimeoutExpired:
-                result = "TLE"
-            else:
-                if(sub.returncode != 0):
-                    result = "RTE"
+            if(result == None):
+                result = "NI"
 
             result_file.seek(0)
-            answer = [ ('S', result.strip("\n")) for result in result_file.readlines()]
+            answer = self.preview_output(result_file)
 
-        input_file.close()
         result_file.close()
 
-        return result, answer   
+        return result, answer, execution
+
+    def stream_sample(self, sample):
+        """
+        Test a sample comparing the program output while it runs. The
+        program is killed on the first incorrect line so the memory used
+        doesn't depend on the output size.
+        """
+        answer = None
+        killed = False
+
+        # Last correct lines shown before the first difference
+        context = deque(maxlen=Config.get_diff_context())
+
+        input = self.get_input(sample)
+        with self.open_expected(sample) as output_file:
+            result_file = None
+            if self.create_files:
+                result_file = open(Path(self.sample_folder, f"{sample}.res"), "wb")
+
+            execution = self.start_execution(subprocess.PIPE, subprocess.PIPE)
+
+            # The output is read in chunks by the execution, which enforces
+            # the output limit, and split into lines with universal newlines
+            decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("UTF-8")(errors="replace"), translate=True)
+            def read_lines():
+                pending = ""
+                with contextlib.closing(execution.read_chunks(input)) as chunks:
+                    for chunk in chunks:
+                        if(result_file != None):
+                            result_file.write(chunk)
+                        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+                        yield from lines
+                pending += decoder.decode(b"", final=True)
+                if(pending != ""):
+                    yield pending
+
+            lines = read_lines()
+            try:
+                for line in lines:
+                    expected = output_file.readline()
+                    if(expected == "" or expected.strip("\n") != line):
+                        killed = True
+                        answer = [('S', context_line) for context_line in context] + [('D', line)]
+                        if(expected != ""):
+                            answer.append(('I', expected.strip("\n")))
+                        break
+                    context.append(line)
+                else:
+                    expected = output_file.readline()
+                    if(expected != ""):
+                        answer = [('S', context_line) for context_line in context] + [('I', expected.strip("\n"))]
+            finally:
+                # Closing the lines kills the program if it is still running
+                lines.close()
+                if(result_file != None):
+                    result_file.close()
+
+        if(killed):
+            result = "WA"
+        elif(execution.get_verdict() != None):
+            result = execution.get_verdict()
+        elif(answer != None):
+            result = "WA"
+        else:
+            result = "AC"
+
+        return result, answer, execution
+
+    def interact_sample(self, sample, full):
+        """
+        Test a sample connecting the program with the interactor, which
+        receives the sample input and answer files
+
+        Returns:
+            tuple: Verdict, transcript followed by the interactor feedback and the execution
+        """
+        # The interactor reads the input file, the prefetched input isn't used
+        with self.prefetch_lock:
+            self.prefetched.pop(sample, None)
+
+        with self.sample_files(sample, full) as (input_file, answer_file):
+            execution = self.start_execution(subprocess.PIPE, subprocess.PIPE)
+            interaction = Interaction(execution, self.interactor, input_file, answer_file, self.limits.timeout).run()
+
+        answer = list(interaction.transcript)
+        if(self.create_files):
+            with open(Path(self.sample_folder, f"{sample}.res"), "w") as file:
+                for op, line in answer:
+                    file.write(f"{">" if op == 'P' else "<"} {line}\n")
+        answer += [('M', line) for line in interaction.judge_message.splitlines()]
+
+        # The interactor usage is shown next to the program usage
+        execution.interactor = interaction.interactor
+        return interaction.get_verdict(), answer, execution
+
+    def check_sample(self, sample) -> Future:
+        """
+        Run a sample writing the program output to a file that is given to
+        the checker as `checker <input> <output> <answer>`, so the output
+        is never copied
+
+        Returns:
+            Future: Verdict, checker feedback and execution of the test
+        """
+        input = self.get_input(sample)
+
+        if(self.create_files):
+            output_path = Path(self.sample_folder, f"{sample}.res")
+            result_file = open(output_path, "wb")
+        else:
+            result_file = tempfile.NamedTemporaryFile(suffix=".res", delete=False)
+            output_path = Path(result_file.name)
+
+        try:
+            with result_file:
+                execution = self.start_execution(subprocess.PIPE, result_file)
+                execution.communicate(input)
+        except BaseException:
+            if(not self.create_files):
+                output_path.unlink(missing_ok=True)
+            raise
+
+        def check():
+            try:
+                result = execution.get_verdict()
+                if(result != None):
+                    return result, None, execution
+                return *self.run_checker(sample, output_path), execution
+            finally:
+                if(not self.create_files):
+                    output_path.unlink(missing_ok=True)
+
+        return self.checker_executor.submit(check)
+
+    def run_checker(self, sample, output_path: Path):
+        """
+        Check the output of a sample with a testlib checker, which exits with
+        0 if the output is correct, 1 if it is wrong and 2 if it is malformed
+
+        Returns:
+            tuple: Verdict and the checker feedback
+        """
+        with self.sample_files(sample, True) as (input_file, answer_file):
+            checker = Execution(
+                [self.checker, input_file, output_path, answer_file],
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                timeout=self.limits.timeout, limits=Limits()
+            )
+            self.add_execution(checker)
+            feedback = checker.communicate().decode(errors="replace")
+
+        answer = [('M', line) for line in feedback.splitlines()]
+        result = self.checker_verdicts.get(checker.returncode, "JE")
+        if(result == "JE"):
+            answer.append(('M', f"The checker exited with code {checker.returncode}"))
+        return result, answer
+
+    def preview_output(self, file):
+        """
+        Get the first and the last lines of an output reading it line by
+        line, so the lines in between aren't kept in memory
+
+        Returns:
+            list: Answer lines of the preview
+        """
+        max_lines = Config.get_diff_lines()
+        head_size = max_lines // 2
+        head = []
+        tail = deque(maxlen=max(0, max_lines - head_size - 1))
+
+        skipped = 0
+        for line in file:
+            line = ('S', line.strip("\n"))
+            if(len(head) < head_size):
+                head.append(line)
+                continue
+            if(len(tail) == tail.maxlen):
+                skipped += 1
+            tail.append(line)
+
+        answer = head
+        if(skipped > 0):
+            answer.append(('M', f"{skipped} lines skipped"))
+        return answer + list(tail)
+
+    def compare_outputs(self, file1, file2):
+        """
+        Compare the program output with the expected output using the comparator of the problem
+
+        Returns:
+            tuple: If the outputs match and the answer lines to show
+        """
+        if(self.comparator == "tokens"):
+            return compare_tokens(file1, file2, self.tolerance)
+        return self.compare_files(file1, file2)
 
     def compare_files(self, file1, file2):
         strip_endline = lambda x: x.strip("\n")
         file1_lines = list(map(strip_endline, file1.readlines()))
         file2_lines = list(map(strip_endline, file2.readlines()))
 
+        # Accepted outputs don't need a diff
+        is_correct_answer = file1_lines == file2_lines
+        if(is_correct_answer):
+            answer = [('S', line) for line in file1_lines]
+        else:
+            answer = diff_lines(file1_lines, file2_lines)
+
+        return is_correct_answer, answer
 
-        length1 = len(file1_lines) + 1
-        length2 = len(file2_lines) + 1
+    def format_answer_line(self, op, line):
+        color = ""
+        char = " "
+        if(op == 'D'):
+            char = "-"
+            color = bold + rgb(Color("#ff7777"))
+        elif(op == 'I'):
+            char = "+"
+            color = bold + rgb(Color("#77ff78"))
+        elif(op == 'P'):
+            char = ">"
+            color = bold + rgb(Color("#9972CC"))
+        elif(op == 'J'):
+            char = "<"
+            color = bold + rgb(Color("#00FFFF"))
+        elif(op == 'M'):
+            char = "!"
+            color = dim
 
-        memo_dis = [[0 for i in range(length1)] for j in range(length2)]
-        memo_op = [['E' for i in range(length1)] for j in range(length2)]
+        # Spaces of the outputs are made visible, messages are prose
+        if(op != 'M'):
+            line = line.replace(" ", f"{dim}·{clear}{color}")
+        return f"{color}{char} {line}{clear}\n"
 
-        for i in range(length1):
-            memo_dis[0][i] = 0
-            memo_op[0][i] = 'D'
+    def print_answer(self, answer):
+        """
+        Print the answer lines of a test. Differences are shown in hunks
+        with some context lines, at most `diff-lines` lines are printed and
+        everything is written at once. Messages are always printed.
+        """
+        context = Config.get_diff_context()
+        max_lines = Config.get_diff_lines()
 
-        for j in range(length2):
-            memo_dis[j][0] = 0
-            memo_op[j][0] = 'I'
+        hunks = group_hunks(answer, context)
+        changes = len(hunks) > 0
+        if(not changes):
+            hunks = [(0, len(answer))]
 
-        memo_op[0][0] = 'S'
+        parts = []
+        messages = []
+        printed = 0
+        shown = 0
 
-        for i2 in range(1, length2):
-            for i1 in range(1, length1):
-                res = memo_dis[i2 - 1][i1]
-                op = 'I'
+        # Line of the program output and the expected output of the next operation
+        position = 0
+        output_line = 1
+        expected_line = 1
+        for start, end in hunks:
+            if(printed >= max_lines):
+                break
 
-                if(res < memo_dis[i2][i1 - 1]):
-                    res = memo_dis[i2][i1 - 1]
-                    op = 'D'
+            for op, line in answer[position:start]:
+                output_lines, expected_lines = count_lines(op, line)
+                output_line += output_lines
+                expected_line += expected_lines
+                if(op == 'M'):
+                    messages.append((op, line))
+            position = start
 
-                if(file1_lines[i1 - 1] == file2_lines[i2 - 1] and res < memo_dis[i2 - 1][i1 - 1] + 1):
-                    res = memo_dis[i2 - 1][i1 - 1] + 1
-                    op = 'S'
+            if(changes and (start > 0 or len(hunks) > 1)):
+                output_size = sum(count_lines(op, line)[0] for op, line in answer[start:end])
+                expected_size = sum(count_lines(op, line)[1] for op, line in answer[start:end])
+                parts.append(f"{dim}{rgb(Color("#00FFFF"))}@@ -{output_line},{output_size} +{expected_line},{expected_size} @@{clear}\n")
 
-                memo_dis[i2][i1] = res
-                memo_op[i2][i1] = op
+            for op, line in answer[start:end]:
+                if(printed >= max_lines):
+                    break
+                # Lines left out of a cached answer can't be printed
+                if(op != 'K'):
+                    parts.append(self.format_answer_line(op, line))
+                    printed += 1
+                output_lines, expected_lines = count_lines(op, line)
+                output_line += output_lines
+                expected_line += expected_lines
+                shown = position = position + 1
 
-        answer = []
-        i1 = length1 - 1
-        i2 = length2 - 1
-        while i1 != 0 or i2 != 0:
-            if(memo_op[i2][i1] == 'S'):
-                i1 -= 1
-                i2 -= 1
-                answer.append(('S', file1_lines[i1]))
-            elif(memo_op[i2][i1] == 'D'):
-                i1 -= 1
-                answer.append(('D', file1_lines[i1]))
-            else:
-                i2 -= 1
-                answer.append(('I', file2_lines[i2]))
-        answer.reverse()
+        rest = answer[shown:]
+        if(changes):
+            hidden = sum(op in ['D', 'I'] for op, _ in rest)
+            if(hidden > 0):
+                parts.append(f"{dim}... {hidden} more differences{clear}\n")
+        else:
+            hidden = sum(line if op == 'K' else op != 'M' for op, line in rest)
+            if(hidden > 0):
+                parts.append(f"{dim}... {hidden} more lines{clear}\n")
+        messages += [(op, line) for op, line in rest if op == 'M']
+        parts += [self.format_answer_line(op, line) for op, line in messages]
 
-        is_correct_answer = memo_dis[length2 - 1][length1 - 1] == length1 - 1 and length1 == length2
-        return is_correct_answer, answer
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
 
-    def print_answer(self, answer):
-        for op, line in answer:
-            color = ""
-            char = " "
-            if(op == 'D'):
-                char = "-"
-                color = bold + rgb(Color("#ff7777"))
-            elif(op == 'I'):
-                char = "+"
-                color = bold + rgb(Color("#77ff78"))
+    def print_result(self, sample, result, answer, execution):
+        usage = f" {dim}{format_usage(execution)}{clear}"
+        if(getattr(execution, "interactor", None) != None):
+            usage += f" {dim}| interactor {format_usage(execution.interactor)}{clear}"
+        if(getattr(execution, "cached", False)):
+            usage += f" {dim}| cached{clear}"
+        if(result == "AC"):
+            print(f"{bold}Test {sample}: {rgb(color_dic["AC"])}PASSED {check}{usage}")
+        elif(result == "NI"):
+            print(f"{bold}Test {sample}: {rgb(color_dic["CE"])}RAN{clear}{usage}")
+        else:
+            print(f"{bold}Test {sample}: {rgb(color_dic["WA"])}FAILED {cross}{usage}")
 
-            line = line.replace(" ", f"{dim}·{clear}{color}")
-            print(f"{color}{char} {line}{clear}")
+        if(self.output_type == "full" or self.output_type == "error"):
+            if(result == "TLE"):
+                print(f"  Your program ran out of time {bold}{rgb(color_dic[result])}{result}{clear}")
+            elif(result == "MLE"):
+                print(f"  Your program used too much memory {bold}{rgb(color_dic[result])}{result}{clear}")
+            elif(result == "OLE"):
+                print(f"  Your program wrote too much output {bold}{rgb(color_dic[result])}{result}{clear}")
+            elif(result == "RTE"):
+                print(f"  Your program crashed during execution {bold}{rgb(color_dic[result])}{result}{clear}")
+            elif(result == "WA"):
+                if(answer != None):
+                    self.print_answer(answer)
+                print(f"  Your output is incorrect {bold}{rgb(color_dic[result])}{result}{clear}")
+            elif(result == "PE"):
+                if(answer != None):
+                    self.print_answer(answer)
+                print(f"  Your output is malformed {bold}{rgb(color_dic[result])}{result}{clear}")
+            elif(result == "JE"):
+                if(answer != None):
+                    self.print_answer(answer)
+                if(getattr(execution, "interactor", None) != None):
+                    print(f"  The interactor failed with exit code {execution.interactor.returncode} {bold}{rgb(color_dic[result])}{result}{clear}")
+                else:
+                    print(f"  The checker failed {bold}{rgb(color_dic[result])}{result}{clear}")
+
+        if(self.output_type == "full"):
+            if(result == "AC"):
+                if(answer != None):
+                    self.print_answer(answer)
+                print(f"  Your output is correct {bold}{rgb(color_dic[result])}{result}{clear}")
+            elif(result == "NI"):
+                self.print_answer(answer)
+                print(f"  This is your program output")
+        
+        print_line()
+
+    def get_last_results(self) -> dict:
+        """
+        Get the last verdict and running time of every test from the history,
+        nothing if it can't be read
+        """
+        try:
+            return self.history.get_last_results()
+        except sqlite3.Error:
+            return {}
+
+    @staticmethod
+    def get_order(last_result) -> tuple:
+        """
+        Get the sort key of a test from its last result, the tests that
+        failed last time go first and then the fastest ones. Tests without
+        a result run after the failed ones and before the ones that passed.
+        """
+        if(last_result == None):
+            return (1, 0)
+
+        verdict, wall_time = last_result
+        failed = verdict not in ["AC", "NI"]
+        return (0 if failed else 1, wall_time if wall_time != None else math.inf)
+
+    def run_samples(self, names = None):
+        """
+        Run the samples and yield their results in natural-sort order
+
+        With more than one job the samples run concurrently in a pool of
+        workers and their results are yielded once all of them finished.
+        Nothing else is yielded once the run is cancelled. Every test
+        prefetches the sample that runs once a worker gets free, and its
+        output is checked by the checker while the next tests run.
+
+        With fail fast the tests that failed last time and then the fastest
+        ones run first, and the first failed test stops the run. The tests
+        killed by the stop aren't yielded.
+
+        Args:
+            names (set): Names of the samples to run, None to run all of them
+        """
+        samples = [(full, sample) for full, sample in self.samples if names == None or sample in names]
+        if(self.fail_fast and self.history != None):
+            last_results = self.get_last_results()
+            samples.sort(key=lambda sample: self.get_order(last_results.get(sample[1])))
+
+        self.stopped.clear()
+
+        # Tests that finished before the run was stopped
+        finished = set()
+
+        def check_result(future):
+            if(self.stopped.is_set()):
+                return
+            finished.add(future)
+            if(future.exception() == None and future.result()[0] not in ["AC", "NI"]):
+                self.stop()
+
+        def test_sample(index):
+            if(self.cancelled.is_set() or self.stopped.is_set()):
+                return None
+            if(index + self.jobs < len(samples)):
+                self.prefetch_input(samples[index + self.jobs][1])
+
+            full, sample = samples[index]
+            future = self.start_sample(sample, full)
+            if(self.fail_fast):
+                future.add_done_callback(check_result)
+            return future
+
+        def get_result(future):
+            if(future == None):
+                return None
+            result = future.result()
+            if(self.stopped.is_set() and future not in finished):
+                return None
+            return result
+
+        if(self.jobs <= 1):
+            # The output of a test is checked while the next one runs, it is
+            # shown once it was checked or the next test finished
+            pending = deque()
+            for index, (_, sample) in enumerate(samples):
+                if(self.cancelled.is_set()):
+                    return
+                if(self.stopped.is_set()):
+                    break
+                loader = Loader(f"Running test {sample}...", end_description="", color=Color("#00FFFF"))
+                loader.start()
+                try:
+                    pending.append((sample, test_sample(index)))
+                finally:
+                    loader.stop()
+                if(self.cancelled.is_set()):
+                    return
+
+                while(len(pending) > 0 and (len(pending) > 1 or index + 1 == len(samples) or pending[0][1].done())):
+                    sample, future = pending.popleft()
+                    result = get_result(future)
+                    if(self.cancelled.is_set()):
+                        return
+                    if(result != None):
+                        yield sample, *result
+
+            # Tests being checked when the run stopped
+            for sample, future in pending:
+                result = get_result(future)
+                if(self.cancelled.is_set()):
+                    return
+                if(result != None):
+                    yield sample, *result
+            return
 
-    def run_tests(self):
+        total = len(samples)
+        loader = Loader(f"Running tests (0/{total})...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [executor.submit(test_sample, index) for index in range(len(samples))]
+                for done, _ in enumerate(as_completed(futures), start=1):
+                    loader.change_description(f"Running tests ({done}/{total})...")
+                results = [get_result(future.result()) for future in futures]
+        finally:
+            loader.stop()
+
+        if(self.cancelled.is_set()):
+            return
+        for (_, sample), result in zip(samples, results):
+            if(result != None):
+                yield sample, *result
+
+    def run_tests(self, names = None):
         correct_test = 0
         run_test = 0
         fail_test = 0
 
-        # Test full tests
-        for full, sample in self.samples:
-            loader = Loader(f"Running test {sample}...", end_description="", color=Color("#00FFFF"))
-            loader.start()
-            result, asnwer = self.test_sample(sample, full)
-            loader.stop()
+        slowest = None
+        total_cpu_time = 0
+        max_rss = None
+
+        results = []
+        for sample, result, answer, execution in self.run_samples(names):
+            results.append((sample, result, execution))
+            if(slowest == None or execution.wall_time > slowest[1].wall_time):
+                slowest = (sample, execution)
+            if(execution.cpu_time != None):
+                total_cpu_time += execution.cpu_time
+            if(execution.max_rss != None):
+                max_rss = max(execution.max_rss, max_rss or 0)
+
             if(result == "AC"):
                 correct_test += 1
-                print(f"{bold}Test {sample}: {rgb(color_dic["AC"])}PASSED {check}")
             elif(result == "NI"):
                 run_test += 1
-                print(f"{bold}Test {sample}: {rgb(color_dic["CE"])}RAN{clear}")
             else:
                 fail_test += 1
-                print(f"{bold}Test {sample}: {rgb(color_dic["WA"])}FAILED {cross}")
-
-            if(self.output_type == "full" or self.output_type == "error"):
-                if(result == "TLE"):
-                    print(f"  Your program ran out of time {bold}{rgb(color_dic[result])}{result}{clear}")
-                elif(result == "RTE"):
-                    print(f"  Your program crashed during execution {bold}{rgb(color_dic[result])}{result}{clear}")
-                elif(result == "WA"):
-                    self.print_answer(asnwer)
-                    print(f"  Your output is incorrect {bold}{rgb(color_dic[result])}{result}{clear}")
-
-            if(self.output_type == "full"):
-                if(result == "AC"):
-                    self.print_answer(asnwer)
-                    print(f"  Your output is correct {bold}{rgb(color_dic[result])}{result}{clear}")
-                elif(result == "NI"):
-                    self.print_answer(asnwer)
-                    print(f"  This is your program output")
-            
-            print_line()
+
+            self.print_result(sample, result, answer, execution)
+
+        if(self.verdict_cache != None):
+            self.verdict_cache.save()
+        if(self.history != None):
+            try:
+                self.history.add_run(self.source_hash, results)
+            except sqlite3.Error as e:
+                display_warning(f"Couldn't save the run in the history: {e}")
+
+        if(self.cancelled.is_set()):
+            return None
 
         summary = []
         if(correct_test > 0):
@@ -242,50 +979,583 @@ class Tester():
             print(f"{bold}Summary: " + f"{bold}, ".join(summary))
         else:
             print(f"{bold}Summary:{clear} No test ran")
+
+        if(self.stopped.is_set()):
+            print(f"{dim}Stopped after the first failed test{clear}")
+
+        if(slowest != None):
+            profile = [f"{bold}Slowest:{clear} test {slowest[0]} ({format_time(slowest[1].wall_time)})"]
+            if(slowest[1].cpu_time != None):
+                profile.append(f"{bold}Total CPU:{clear} {format_time(total_cpu_time)}")
+            if(max_rss != None):
+                profile.append(f"{bold}Max memory:{clear} {format_memory(max_rss)}")
+            print(", ".join(profile))
+
         return correct_test, fail_test, run_test
 
-    def run_interactive(self):
-        print(f"{bold}Running interactive your interactive program:{clear}")
+    def run_input(self, input: bytes, binary = None):
+        """
+        Run a program with an input kept in memory
+
+        Args:
+            input (bytes): Program input
+            binary (Path): Program to run, by default the compiled source
+
+        Returns:
+            tuple: Finished execution and the program output
+        """
+        if(binary == None):
+            binary = self.source
+
+        execution = Execution(binary, stdin=subprocess.PIPE, stdout=subprocess.PIPE, limits=self.limits)
+        output = execution.communicate(input)
+        return execution, output
+
+    def outputs_match(self, output: bytes, expected: bytes) -> bool:
+        """Check if two outputs match with the comparator of the problem"""
+        if(self.comparator == "tokens"):
+            return compare_tokens(open_output(output), open_output(expected), self.tolerance)[0]
+        return output.splitlines() == expected.splitlines()
+
+    def minimize(self, sample, reference = None):
+        """
+        Shrink the input of a failing sample while it keeps failing and save
+        the reduced input next to the original one
+
+        Without a reference solution the reduced input must give the same
+        verdict as the sample. With a reference solution it must make the
+        program fail or give a different output than the reference.
+
+        Args:
+            sample (str): Sample name
+            reference (Path): Reference solution source file
+
+        Returns:
+            str: Reduced sample name or None if the sample doesn't fail
+        """
+        full = Path(self.sample_folder, f"{sample}.out").exists()
+        if(not Path(self.sample_folder, f"{sample}.in").exists()):
+            raise FileNotFoundError(f"Couldn't find test '{sample}'")
+
+        reference_binary = None
+        if(reference != None):
+            loader = Loader("Compiling reference solution...", end_description="", color=Color("#00FFFF"))
+            loader.start()
+            try:
+                reference_binary = Compiler().compile(reference)
+            finally:
+                loader.stop()
+
+        loader = Loader(f"Running test {sample}...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            result, _, _ = self.test_sample(sample, full)
+        finally:
+            loader.stop()
+
+        if(result in ["AC", "NI"] and reference_binary == None):
+            display_error(f"Test {sample} doesn't fail, use a reference solution to look for a different output")
+            return None
+        if(result == "WA" and reference_binary == None):
+            display_error("A reference solution is needed to minimize a wrong answer")
+            return None
+
+        def is_failing(lines):
+            input = "".join(line + "\n" for line in lines).encode()
+            execution, output = self.run_input(input)
+            verdict = execution.get_verdict()
+            if(reference_binary == None):
+                return verdict == result
+
+            reference_execution, expected = self.run_input(input, reference_binary)
+            if(reference_execution.get_verdict() != None):
+                # The reference must accept the input for it to be valid
+                return False
+            return verdict != None or not self.outputs_match(output, expected)
+
+        with open(Path(self.sample_folder, f"{sample}.in"), "r") as file:
+            lines = file.read().splitlines()
+
+        if(not is_failing(lines)):
+            display_error(f"Test {sample} doesn't fail against the reference solution")
+            return None
+
+        loader = Loader("Minimizing input...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                # Remove whole lines and then single tokens inside the remaining lines
+                progress = lambda items: loader.change_description(f"Minimizing input ({len(items)} lines)...")
+                lines = ddmin(lines, is_failing, executor, progress)
+
+                tokens = [(i, token) for i, line in enumerate(lines) for token in line.split()]
+                def join_tokens(tokens):
+                    reduced = [[] for _ in lines]
+                    for i, token in tokens:
+                        reduced[i].append(token)
+                    return [" ".join(line) for line in reduced if len(line) > 0]
+
+                progress = lambda items: loader.change_description(f"Minimizing input ({len(items)} tokens)...")
+                tokens = ddmin(tokens, lambda tokens: is_failing(join_tokens(tokens)), executor, progress)
+                if(is_failing(join_tokens(tokens))):
+                    lines = join_tokens(tokens)
+        finally:
+            loader.stop()
+
+        minimized = f"{sample}.min"
+        input = "".join(line + "\n" for line in lines)
+        with open(Path(self.sample_folder, f"{minimized}.in"), "w") as file:
+            file.write(input)
+
+        if(reference_binary != None):
+            _, expected = self.run_input(input.encode(), reference_binary)
+            with open(Path(self.sample_folder, f"{minimized}.out"), "wb") as file:
+                file.write(expected)
+
+        print(f"{bold}Minimized test {sample}:{clear} {len(lines)} lines saved as test {minimized}")
+        return minimized
+
+    def benchmark_sample(self, sample, repetitions, warmup = 1):
+        """
+        Run a sample several times and get the running time of every run
+
+        Args:
+            sample (str): Sample name
+            repetitions (int): Number of measured runs
+            warmup (int): Number of runs before the measured ones
+
+        Returns:
+            tuple: Verdict of the first failed run or None and the list of times
+        """
+        times = []
+        with self.sample_files(sample, False) as (input_path, _), open(input_path, "rb") as input_file:
+            for i in range(warmup + repetitions):
+                input_file.seek(0)
+                execution = run(self.source, stdin=input_file, stdout=subprocess.DEVNULL, limits=self.limits)
+
+                result = execution.get_verdict()
+                if(result != None):
+                    return result, times
+
+                if(i >= warmup):
+                    times.append(execution.cpu_time if execution.cpu_time != None else execution.wall_time)
+
+        return None, times
+
+    def benchmark(self, repetitions, warmup = 1):
+        """
+        Measure the running time of every sample and display its statistics
+
+        Args:
+            repetitions (int): Number of measured runs of every sample
+            warmup (int): Number of runs of every sample before the measured ones
+        """
+        total_min = 0
+        total_median = 0
+        failed = False
+
+        for _, sample in self.samples:
+            loader = Loader(f"Benchmarking test {sample}...", end_description="", color=Color("#00FFFF"))
+            loader.start()
+            try:
+                result, times = self.benchmark_sample(sample, repetitions, warmup)
+            finally:
+                loader.stop()
+
+            if(result != None):
+                failed = True
+                print(f"{bold}Test {sample}: {rgb(color_dic["WA"])}FAILED {cross} {bold}{rgb(color_dic[result])}{result}{clear}")
+                continue
+
+            median = statistics.median(times)
+            p95 = statistics.quantiles(times, n=20, method="inclusive")[-1] if len(times) > 1 else times[0]
+            stdev = statistics.stdev(times) if len(times) > 1 else 0
+
+            total_min += min(times)
+            total_median += median
+
+            stats = [
+                f"{bold}min{clear} {format_time(min(times))}",
+                f"{bold}median{clear} {format_time(median)}",
+                f"{bold}p95{clear} {format_time(p95)}",
+                f"{bold}stdev{clear} {format_time(stdev)}",
+            ]
+            print(f"{bold}Test {sample}:{clear} " + " · ".join(stats))
+
         print_line()
+        if(failed):
+            print(f"{bold}Total:{clear} Not available, some tests failed")
+        else:
+            print(f"{bold}Total:{clear} {bold}min{clear} {format_time(total_min)} · {bold}median{clear} {format_time(total_median)} {dim}({repetitions} runs per test){clear}")
 
-        def populate_queue(stream, myqueue):
-            while True:
-                line = stream.readline()
-                if(line == None or line == b''):
-                    #print("Exit", stream.name)
-                    stream.close()
-                    break
-                else:
-                    print(f"{rgb(Color("#9972CC"))}{bold}{line.decode("UTF-8")}{clear}", end="")
-                    myqueue.put(line)
-                time.sleep(0.001)
-
-        def get_input(stream, thread):
-            while True:
-                data = input() + "\n"
-                stream.write(data.encode("UTF-8"))
-                stream.flush()
-                time.sleep(0.025)
-
-        process = subprocess.Popen(self.source,stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        output_queue = queue.Queue()
-        thread1 = Thread(target=populate_queue, daemon=True, args=(process.stdout, output_queue))
-        thread2 = Thread(target=populate_queue, daemon=True, args=(process.stderr, output_queue))
-        thread3 = Thread(target=get_input, daemon=True, args=(process.stdin, "a"))
-
-        threads = [thread1, thread2, thread3]
-        for thread in threads:
+    def generate_outputs(self, reference):
+        """
+        Write the missing expected outputs of the samples running a
+        reference solution on their inputs in a pool of workers. Every
+        output is written to a temporary file that replaces the final one,
+        so a cancelled run never leaves a partial output.
+
+        Args:
+            reference (Path): Reference solution source file
+
+        Returns:
+            int: Number of generated outputs
+        """
+        loader = Loader("Compiling reference solution...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            reference_binary = Compiler().compile(reference)
+        finally:
+            loader.stop()
+
+        # The reference is allowed to be slower than the solution
+        limits = Limits(None, self.limits.memory, self.limits.output)
+        timeout = None if self.limits.timeout == None else 10 * self.limits.timeout
+
+        def generate_output(sample):
+            input = self.read_input(sample)
+            execution = Execution(reference_binary, stdin=subprocess.PIPE, stdout=subprocess.PIPE, timeout=timeout, limits=limits)
+            self.add_execution(execution)
+            output = execution.communicate(input)
+
+            result = execution.get_verdict()
+            if(result != None):
+                return result
+
+            output_file = Path(self.sample_folder, f"{sample}.out")
+            temporary_file = Path(self.sample_folder, f".{sample}.out.{os.getpid()}")
+            try:
+                temporary_file.write_bytes(output)
+                os.replace(temporary_file, output_file)
+            finally:
+                temporary_file.unlink(missing_ok=True)
+            return None
+
+        samples = [sample for full, sample in self.samples if not full]
+        total = len(samples)
+        generated = 0
+
+        loader = Loader(f"Generating expected outputs (0/{total})...", end_description="", color=Color("#00FFFF"))
+        loader.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = {executor.submit(generate_output, sample): sample for sample in samples}
+                failures = []
+                for done, future in enumerate(as_completed(futures), start=1):
+                    loader.change_description(f"Generating expected outputs ({done}/{total})...")
+                    result = future.result()
+                    if(result == None):
+                        generated += 1
+                    else:
+                        failures.append((futures[future], result))
+        finally:
+            loader.stop()
+
+        for sample, result in sorted(failures):
+            display_warning(f"{reference.name} failed on test {sample} {bold}{rgb(color_dic[result])}{result}{clear}, its output wasn't generated")
+        if(total > 0):
+            print(f"{bold}Generated {generated} expected outputs{clear} with {reference.name}")
+            print_line()
+
+        self.get_samples()
+        return generated
+
+    @staticmethod
+    def get_speedup(times: list, compare_times: list):
+        """
+        Get the speedup of the source over the compared version from paired
+        running times, the geometric mean of their ratios and its 95%
+        confidence interval from Student's t distribution, which stays
+        honest for the few runs of a benchmark
+
+        Returns:
+            tuple: Speedup and the bounds of its interval, the bounds are None
+            with a single measure and the tuple is None if no time was measured
+        """
+        logs = [math.log(compare_time / time) for time, compare_time in zip(times, compare_times) if time > 0 and compare_time > 0]
+        if(len(logs) == 0):
+            return None
+
+        mean = statistics.fmean(logs)
+        if(len(logs) < 2):
+            return math.exp(mean), None, None
+
+        freedom = len(logs) - 1
+        quantile = t_quantiles[max(df for df in t_quantiles if df <= freedom)]
+        margin = quantile * statistics.stdev(logs) / math.sqrt(len(logs))
+        return math.exp(mean), math.exp(mean - margin), math.exp(mean + margin)
+
+    def compare_sample(self, sample, repetitions, warmup = 1):
+        """
+        Run the source and the compared version interleaved on a sample so
+        that noise affects both versions alike
+
+        Args:
+            sample (str): Sample name
+            repetitions (int): Number of measured runs of every version
+            warmup (int): Number of runs of every version before the measured ones
+
+        Returns:
+            tuple: Verdict and version of the first failed run or None, the
+                running times and the output of both versions
+        """
+        input = self.get_input(sample)
+        binaries = [self.source, self.compare_binary]
+        times = ([], [])
+        outputs = [None, None]
+
+        for i in range(warmup + repetitions):
+            # The version that runs first alternates
+            for version in ([0, 1] if i % 2 == 0 else [1, 0]):
+                execution, output = self.run_input(input, binaries[version])
+
+                result = execution.get_verdict()
+                if(result != None):
+                    return (result, version), times, outputs
+
+                if(outputs[version] == None):
+                    outputs[version] = output
+                if(i >= warmup):
+                    times[version].append(execution.cpu_time if execution.cpu_time != None else execution.wall_time)
+
+        return None, times, outputs
+
+    def compare(self, repetitions, warmup = 1):
+        """
+        Compare the running time of the source with the compared version on
+        every sample, checking that both versions give the same output
+
+        Args:
+            repetitions (int): Number of measured runs of every version on every sample
+            warmup (int): Number of runs of every version before the measured ones
+        """
+        name = self.compare_version.name if isinstance(self.compare_version, Path) else self.compare_version
+        names = [self.cpp_file.name, name]
+        total = [0, 0]
+        failed = False
+
+        for _, sample in self.samples:
+            loader = Loader(f"Comparing test {sample}...", end_description="", color=Color("#00FFFF"))
+            loader.start()
+            try:
+                failure, times, outputs = self.compare_sample(sample, repetitions, warmup)
+            finally:
+                loader.stop()
+
+            if(failure != None):
+                failed = True
+                result, version = failure
+                print(f"{bold}Test {sample}: {rgb(color_dic["WA"])}FAILED {cross} {clear}{names[version]} {bold}{rgb(color_dic[result])}{result}{clear}")
+                continue
+
+            if(not self.outputs_match(outputs[0], outputs[1])):
+                failed = True
+                print(f"{bold}Test {sample}: {rgb(color_dic["WA"])}FAILED {cross}{clear}")
+                if(self.output_type != "minimal"):
+                    _, answer = self.compare_outputs(open_output(outputs[0]), open_output(outputs[1]))
+                    self.print_answer(answer)
+                    print(f"  The outputs of {names[0]} (-) and {names[1]} (+) are different {bold}{rgb(color_dic["WA"])}WA{clear}")
+                continue
+
+            medians = [statistics.median(version_times) for version_times in times]
+            total[0] += medians[0]
+            total[1] += medians[1]
+
+            usage = f"{format_time(medians[0])} vs {format_time(medians[1])}"
+            speedup = self.get_speedup(*times)
+            if(speedup == None):
+                print(f"{bold}Test {sample}:{clear} {usage} {dim}· too fast to compare{clear}")
+                continue
+
+            # A single run has no interval
+            ratio, low, high = speedup
+            color = dim
+            interval = ""
+            if(low != None):
+                interval = f" {dim}[{low:.2f}x, {high:.2f}x]{clear}"
+                if(low > 1):
+                    color = rgb(color_dic["AC"])
+                elif(high < 1):
+                    color = rgb(color_dic["WA"])
+            print(f"{bold}Test {sample}:{clear} {usage} · {bold}speedup{clear} {color}{ratio:.2f}x{clear}{interval}")
+
+        print_line()
+        if(failed):
+            print(f"{bold}Total:{clear} Not available, some tests failed or gave different outputs")
+        elif(total[0] > 0):
+            print(f"{bold}Total:{clear} {format_time(total[0])} vs {format_time(total[1])} · {bold}speedup{clear} {total[1] / total[0]:.2f}x {dim}({names[0]} vs {names[1]}, {repetitions} runs per test, 95% confidence intervals){clear}")
+
+    def watch_run(self, compile, names = None):
+        """
+        Compile the source if needed and run the tests of a watch mode cycle
+
+        Returns:
+            bool: False if the source couldn't be compiled
+        """
+        try:
+            if(compile):
+                self.compile_source()
+            if(not self.cancelled.is_set()):
+                self.run_tests(names)
+        except CompilationError as e:
+            print(e)
+            display_error("Couldn't compile your program")
+            return False
+        except FileNotFoundError as e:
+            display_error(str(e))
+        return True
+
+    def watch(self):
+        """
+        Run the tests every time the source or a sample changes until the
+        user stops it. A change cancels the tests that are still running
+        and only the samples that changed run again, all of them when the
+        source changed.
+        """
+        # An archive is watched through the folder that contains it
+        sample_folder = self.sample_folder if self.archive == None else self.sample_folder.parent
+        watcher = create_watcher([self.path, sample_folder])
+
+        compiled = True
+        run_all = True
+        names = set()
+        worker = None
+
+        def start(compile):
+            def target():
+                nonlocal compiled
+                compiled = self.watch_run(compile, None if run_all else names)
+                if(not self.cancelled.is_set()):
+                    print(f"{dim}Watching for changes... (Ctrl+C to stop){clear}")
+
+            thread = threading.Thread(target=target, daemon=True)
             thread.start()
+            return thread
 
-        while(process.poll() == None and threads[0].is_alive):
-            time.sleep(0.1)
-        
+        try:
+            worker = start(False)
+            while(True):
+                changes = watcher.wait()
+                # Editors save files in several steps
+                while(True):
+                    more_changes = watcher.wait(0.1)
+                    if(len(more_changes) == 0):
+                        break
+                    changes |= more_changes
+
+                source_changed = self.cpp_file in changes
+                changed_samples = {path.stem for path in changes if path.parent == self.sample_folder and path.suffix in [".in", ".out"]}
+                archive_changed = self.archive != None and self.sample_folder in changes
+                if(not source_changed and len(changed_samples) == 0 and not archive_changed):
+                    continue
+
+                # Tests of an unfinished run still have to run
+                unfinished = worker.is_alive()
+                self.cancel()
+                worker.join()
+                self.cancelled.clear()
+
+                if(not unfinished):
+                    run_all = False
+                    names = set()
+                run_all = run_all or source_changed or archive_changed or not compiled
+                names |= changed_samples
+
+                if(archive_changed):
+                    self.archive.close()
+                    try:
+                        self.archive = SampleArchive(self.sample_folder)
+                    except FileNotFoundError as e:
+                        display_error(str(e))
+                        continue
+                if(len(changed_samples) > 0 or archive_changed):
+                    self.get_samples()
+
+                print(f"{bold}Changes detected{clear}, running {"all the tests" if run_all else f"test {", ".join(sorted(names))}"}")
+                print_line()
+                worker = start(source_changed or not compiled)
+        finally:
+            self.cancel()
+            if(worker != None):
+                worker.join()
+            watcher.close()
+
+    def run_interactive(self):
+        """
+        Run the program connected to the terminal. The program output and
+        the user input are forwarded as soon as they are available and the
+        session ends as soon as the program exits.
+        """
+        print(f"{bold}Running your interactive program:{clear}")
         print_line()
-        print(f"{bold}Program exited {process.poll()}{clear}")
-        if(thread3.is_alive):
-            print("(Press Enter)", end="")
 
-                
+        # Users can take their time to answer, so there is no time limit
+        limits = Limits(None, self.limits.memory, self.limits.output)
+        execution = Execution(self.source, stdin=subprocess.PIPE, stdout=subprocess.PIPE, limits=limits)
+        program_input = execution.process.stdin.fileno()
+        program_output = execution.stdout.fileno()
+        user_input = sys.stdin.fileno()
 
-        
+        selector = selectors.DefaultSelector()
+        selector.register(program_output, selectors.EVENT_READ)
+        selector.register(user_input, selectors.EVENT_READ)
+
+        # The program exit is noticed even if it closed its output before
+        exit_fd = None
+        if(hasattr(os, "pidfd_open")):
+            exit_fd = os.pidfd_open(execution.process.pid)
+            selector.register(exit_fd, selectors.EVENT_READ)
+
+        decoder = codecs.getincrementaldecoder("UTF-8")(errors="replace")
+        color = rgb(Color("#9972CC")) + bold
+        try:
+            finished = False
+            while(not finished):
+                for key, _ in selector.select():
+                    if(key.fd == exit_fd):
+                        finished = True
+                    elif(key.fd == program_output):
+                        data = os.read(program_output, 64 * 1024)
+                        if(data == b""):
+                            selector.unregister(program_output)
+                            finished = exit_fd == None
+                        else:
+                            print(f"{color}{decoder.decode(data)}{clear}", end="", flush=True)
+                    elif(key.fd == user_input):
+                        data = os.read(user_input, 64 * 1024)
+                        try:
+                            if(data == b""):
+                                selector.unregister(user_input)
+                                execution.process.stdin.close()
+                            else:
+                                os.write(program_input, data)
+                        except BrokenPipeError:
+                            selector.unregister(user_input)
+
+            # Output written right before the exit
+            if(exit_fd != None and program_output in selector.get_map()):
+                text = decoder.decode(execution.stdout.read(), final=True)
+                if(text != ""):
+                    print(f"{color}{text}{clear}", end="")
+        except BaseException:
+            execution.kill()
+            raise
+        finally:
+            selector.close()
+            if(exit_fd != None):
+                os.close(exit_fd)
+            execution.wait()
+            if(not execution.process.stdin.closed):
+                try:
+                    execution.process.stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        print_line()
+        result = execution.get_verdict()
+        if(result != None and result != "RTE"):
+            print(f"{bold}Program stopped {bold}{rgb(color_dic[result])}{result}{clear} {dim}{format_usage(execution)}{clear}")
+        else:
+            print(f"{bold}Program exited with code {execution.returncode}{clear} {dim}{format_usage(execution)}{clear}")
 
+        return execution
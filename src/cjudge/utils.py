@@ -0,0 +1,10 @@
+import re
+
+number_regex = re.compile(r'(\d+)')
+
+def natural_sort_key(name: str) -> list:
+    """
+    Get the key that sorts names in natural order, the numbers inside the
+    names are compared by their value so 'test2' goes before 'test10'
+    """
+    return [int(s) if s.isdigit() else s.lower() for s in number_regex.split(name)]
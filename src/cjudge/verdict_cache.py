@@ -0,0 +1,113 @@
+from pathlib import Path
+import json
+import os
+import threading
+
+class CachedExecution():
+    """
+    Execution of a test restored from the verdict cache, it has the usage
+    of the run that was cached
+    """
+
+    cached = True
+
+    def __init__(self, entry: dict):
+        self.returncode = entry.get("returncode")
+        self.timed_out = False
+        self.output_exceeded = False
+        self.wall_time = entry.get("wall_time")
+        self.cpu_time = entry.get("cpu_time")
+        self.max_rss = entry.get("max_rss")
+
+class VerdictCache():
+    """
+    Verdicts of the tests of a problem saved in `.cjudge/verdicts.json`
+
+    A verdict is stored under a key of everything that changes it, like the
+    binary, the sample and the limits, so a test only runs again when one
+    of them changes. The least recently used verdicts are removed once
+    there are more than `max_entries`.
+    """
+
+    cache_file = Path(".cjudge", "verdicts.json")
+    max_entries = 4096
+
+    # Longest answer stored with a verdict, verdicts with longer answers
+    # aren't cached since their answer couldn't be shown
+    max_answer_lines = 1000
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path): Problem folder
+        """
+        self.path = Path(path, self.cache_file)
+        self.lock = threading.Lock()
+        self.changed = False
+
+        try:
+            with open(self.path, "r") as file:
+                self.entries = json.load(file)
+            if(type(self.entries) != dict):
+                self.entries = {}
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            self.entries = {}
+
+    def get(self, key: str):
+        """
+        Get a cached verdict
+
+        Returns:
+            tuple: Verdict, answer and execution or None if it isn't cached
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if(type(entry) != dict or "result" not in entry):
+                return None
+
+            # Recently used verdicts are kept at the end
+            self.entries[key] = entry
+            self.changed = True
+
+        answer = entry.get("answer")
+        if(answer != None):
+            answer = [tuple(line) for line in answer]
+        return entry["result"], answer, CachedExecution(entry)
+
+    def put(self, key: str, result: str, answer: list, execution):
+        """
+        Cache the verdict of a test
+        """
+        if(answer != None and len(answer) > self.max_answer_lines):
+            return
+
+        entry = {
+            "result": result,
+            "answer": answer,
+            "returncode": execution.returncode,
+            "wall_time": execution.wall_time,
+            "cpu_time": execution.cpu_time,
+            "max_rss": execution.max_rss,
+        }
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while(len(self.entries) > self.max_entries):
+                del self.entries[next(iter(self.entries))]
+            self.changed = True
+
+    def save(self):
+        """
+        Write the cached verdicts if they changed
+        """
+        with self.lock:
+            if(not self.changed):
+                return
+            data = json.dumps(self.entries)
+            self.changed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        with open(temporary_path, "w") as file:
+            file.write(data)
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,152 @@
+from pathlib import Path
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify events of a file that was saved, created by a rename or removed
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+class PollingWatcher():
+    """
+    Watches the files of some folders comparing their modification times
+    """
+
+    def __init__(self, folders: list, interval: float = 0.25):
+        """
+        Args:
+            folders (list): Folders to watch, their subfolders aren't watched
+            interval (float): Seconds between every check
+        """
+        self.folders = [Path(folder) for folder in folders]
+        self.interval = interval
+        self.files = self.get_files()
+
+    def get_files(self) -> dict:
+        files = {}
+        for folder in self.folders:
+            try:
+                entries = list(os.scandir(folder))
+            except FileNotFoundError:
+                continue
+
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files[Path(folder, entry.name)] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def wait(self, timeout: float = None) -> set:
+        """
+        Wait until some file changes
+
+        Args:
+            timeout (float): Maximum seconds to wait, None to wait forever
+
+        Returns:
+            set: Paths of the changed, created or removed files, empty if the timeout expired
+        """
+        end = None if timeout == None else time.monotonic() + timeout
+        while(True):
+            files = self.get_files()
+            changes = {path for path in files.keys() | self.files.keys() if files.get(path) != self.files.get(path)}
+            self.files = files
+            if(len(changes) > 0):
+                return changes
+
+            if(end != None and time.monotonic() >= end):
+                return set()
+            sleep = self.interval if end == None else min(self.interval, max(0, end - time.monotonic()))
+            time.sleep(sleep)
+
+    def close(self):
+        pass
+
+class InotifyWatcher():
+    """
+    Watches the files of some folders with Linux inotify
+    """
+
+    def __init__(self, folders: list):
+        """
+        Args:
+            folders (list): Folders to watch, their subfolders aren't watched
+
+        Raises:
+            OSError: If inotify isn't available
+        """
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if(self.fd < 0):
+            raise OSError(ctypes.get_errno(), "Couldn't start inotify")
+
+        self.folders = {}
+        mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+        try:
+            for folder in folders:
+                wd = self.libc.inotify_add_watch(self.fd, os.fsencode(folder), mask)
+                if(wd < 0):
+                    raise OSError(ctypes.get_errno(), f"Couldn't watch '{folder}'")
+                self.folders[wd] = Path(folder)
+        except BaseException:
+            os.close(self.fd)
+            raise
+
+    def wait(self, timeout: float = None) -> set:
+        """
+        Wait until some file changes
+
+        Args:
+            timeout (float): Maximum seconds to wait, None to wait forever
+
+        Returns:
+            set: Paths of the changed, created or removed files, empty if the timeout expired
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if(len(readable) == 0):
+            return set()
+
+        changes = set()
+        while(True):
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            # Every event is a header followed by the null padded file name
+            offset = 0
+            while(offset < len(data)):
+                wd, _, _, length = struct.unpack_from("iIII", data, offset)
+                offset += struct.calcsize("iIII")
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if(wd in self.folders and name != b""):
+                    changes.add(Path(self.folders[wd], os.fsdecode(name)))
+
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+def create_watcher(folders: list):
+    """
+    Create a watcher of the files of some folders, using inotify when it is
+    available and polling otherwise
+    """
+    if(sys.platform.startswith("linux")):
+        try:
+            return InotifyWatcher(folders)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(folders)
@@ -0,0 +1,20 @@
+import io
+
+from cjudge import comparator
+from cjudge.comparator import compare_tokens, tokenize
+
+def test_tokenize_positions():
+    tokens = list(tokenize(io.StringIO("1 2\n  abc\n\n4")))
+    assert tokens == [("1", 1, 1), ("2", 1, 3), ("abc", 2, 3), ("4", 4, 1)]
+
+def test_tokenize_across_chunks(monkeypatch):
+    monkeypatch.setattr(comparator, "chunk_size", 3)
+    text = "12345 67\n 890 x\ny"
+    tokens = list(tokenize(io.StringIO(text)))
+    assert tokens == [("12345", 1, 1), ("67", 1, 7), ("890", 2, 2), ("x", 2, 6), ("y", 3, 1)]
+
+def test_compare_tokens_tolerance():
+    assert compare_tokens(io.StringIO("0.3333\n"), io.StringIO("0.33333"), 1e-3) == (True, None)
+    matches, answer = compare_tokens(io.StringIO("1 2"), io.StringIO("1 3"), 1e-6)
+    assert not matches
+    assert answer[1:] == [('D', "2"), ('I', "3")]
@@ -0,0 +1,44 @@
+from cjudge import diff
+from cjudge.diff import compress_answer, diff_lines, group_hunks
+
+def apply(answer):
+    return [line for op, line in answer if op != 'I'], [line for op, line in answer if op != 'D']
+
+def test_diff_equal():
+    assert diff_lines(["a", "b"], ["a", "b"]) == [('S', "a"), ('S', "b")]
+
+def test_diff_changed_line():
+    assert diff_lines(["a", "b", "c"], ["a", "x", "c"]) == [('S', "a"), ('D', "b"), ('I', "x"), ('S', "c")]
+
+def test_diff_is_minimal():
+    lines1 = list("abcabba")
+    lines2 = list("cbabac")
+    answer = diff_lines(lines1, lines2)
+    assert apply(answer) == (lines1, lines2)
+    # Shortest edit script of the example of Myers' paper
+    assert sum(op != 'S' for op, _ in answer) == 5
+
+def test_diff_empty():
+    assert diff_lines([], ["a"]) == [('I', "a")]
+    assert diff_lines(["a"], []) == [('D', "a")]
+
+def test_group_hunks():
+    answer = diff_lines([str(i) for i in range(20)], [str(i) if i != 10 else "x" for i in range(20)])
+    hunks = group_hunks(answer, 2)
+    assert len(hunks) == 1
+
+def test_compress_answer():
+    answer = diff_lines([str(i) for i in range(2000)], [str(i) if i != 1000 else "x" for i in range(2000)])
+    answer.append(('M', "message"))
+    compressed = compress_answer(answer, 2, 50)
+    assert compressed == [('K', 998)] + answer[998:1004] + [('M', "message"), ('K', 997)]
+    assert [compressed[start:end] for start, end in group_hunks(compressed, 2)] == [answer[998:1004]]
+
+def test_diff_too_expensive(monkeypatch):
+    monkeypatch.setattr(diff, "max_cost", 4)
+    monkeypatch.setattr(diff, "min_cost", 4)
+    lines1 = [str(i) if i % 3 else "same" for i in range(300)]
+    lines2 = [str(-i) if i % 3 else "same" for i in range(300)]
+    answer = diff_lines(lines1, lines2)
+    assert apply(answer) == (lines1, lines2)
+    assert sum(op == 'S' for op, _ in answer) > 0
@@ -0,0 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from cjudge.minimize import ddmin
+
+def test_ddmin_single_item():
+    assert ddmin(list(range(100)), lambda items: 42 in items) == [42]
+
+def test_ddmin_pair():
+    is_failing = lambda items: 3 in items and 77 in items
+    assert ddmin(list(range(100)), is_failing) == [3, 77]
+
+def test_ddmin_executor():
+    is_failing = lambda items: 3 in items and 77 in items
+    with ThreadPoolExecutor(4) as executor:
+        assert ddmin(list(range(100)), is_failing, executor) == [3, 77]
@@ -0,0 +1,26 @@
+import math
+
+from cjudge.scale import fit_model, models
+
+def test_fit_model_linear():
+    sizes = [1000, 2000, 4000, 8000]
+    times = [0.01 + 2e-5 * size for size in sizes]
+    a, c, error = fit_model(sizes, times, lambda n: n)
+    assert math.isclose(a, 0.01, rel_tol=1e-6)
+    assert math.isclose(c, 2e-5, rel_tol=1e-6)
+    assert error < 1e-9
+
+def test_fit_model_constant():
+    sizes = [1000, 2000, 4000]
+    times = [0.5, 0.5, 0.5]
+    a, c, error = fit_model(sizes, times, dict(models)["O(1)"])
+    assert math.isclose(a + c, 0.5)
+    assert error < 1e-9
+
+def test_fit_model_decreasing():
+    assert fit_model([10, 20, 40], [0.3, 0.2, 0.1], lambda n: n) == None
+
+def test_fit_model_zero_times():
+    fit = fit_model([10, 20, 40], [0, 0, 0], dict(models)["O(1)"])
+    assert fit != None
+    assert all(math.isfinite(value) for value in fit)
@@ -0,0 +1,18 @@
+import math
+
+from cjudge import tester
+
+def test_speedup_interval():
+    times = [1.0, 1.1, 0.9, 1.0]
+    compare_times = [2.0, 2.1, 1.9, 2.2]
+    ratio, low, high = tester.Tester.get_speedup(times, compare_times)
+    assert low < ratio < high
+    assert 1.5 < ratio < 2.5
+
+def test_speedup_single_run():
+    ratio, low, high = tester.Tester.get_speedup([1.0], [3.0])
+    assert math.isclose(ratio, 3.0)
+    assert low == None and high == None
+
+def test_speedup_no_times():
+    assert tester.Tester.get_speedup([0], [0]) == None